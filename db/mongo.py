@@ -1,93 +1,272 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient, IndexModel, ASCENDING
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import OperationFailure, ServerSelectionTimeoutError
+from typing import Optional
+from db.monitoring import PoolMetricsListener
 import os
 from dotenv import load_dotenv
 import logging
 import certifi
 import sys
+import asyncio
+import fcntl
+import tempfile
+
+# main.py loads .env before importing this module; only load it here when
+# the module is run directly
+if __name__ == "__main__":
+    load_dotenv()
 
 # Setup logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[logging.StreamHandler(sys.stdout)]
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
 
+# Connection pool sizing (per worker process). Every gunicorn worker owns its
+# own pool, so gunicorn_config.py lowers MONGO_MAX_POOL_SIZE when
+# workers * max pool size would exceed the cluster's connection limit.
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+
 # Log basic info
-logger.info(f"Python version: {sys.version}")
-logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
-logger.info(f"MongoDB URI exists: {MONGO_URI is not None}")
+logger.debug("Python version: %s", sys.version)
+logger.debug("Environment: %s", os.getenv('ENVIRONMENT', 'development'))
+logger.debug("MongoDB URI exists: %s", MONGO_URI is not None)
+
+# Startup ping timeout in seconds; a worker that can't reach the cluster
+# should fail fast so the platform restarts it instead of hanging
+PING_TIMEOUT = 5.0
+
+# CA bundle for TLS connections to Atlas, resolved once
+CA_FILE = certifi.where()
+
+# Only one worker at a time runs index setup; the others skip it
+INDEX_LOCK_PATH = os.path.join(tempfile.gettempdir(), "meeting-scheduler-indexes.lock")
+
+# Indexes by collection. Names are explicit so ensure_indexes() can tell
+# which ones already exist.
+INDEXES = {
+    "schedule_links": [
+        # Leading with userId also serves the per-user link listing
+        IndexModel([("userId", ASCENDING), ("slug", ASCENDING)], unique=True, name="userId_1_slug_1"),
+        # Public pages look links up by slug alone
+        IndexModel([("slug", ASCENDING)], name="slug_1"),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_1"),
+    ],
+    "availability_windows": [
+        # Per-user listing (dashboard and public page); _id as the second key
+        # also serves the owner-scoped delete and keeps listings in insert order
+        IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)], name="user_id_1__id_1"),
+    ],
+    "events": [
+        # Public schedule page: $in on calendar_id, then the time window bounds
+        IndexModel(
+            [("calendar_id", ASCENDING), ("start_time", ASCENDING), ("end_time", ASCENDING)],
+            name="calendar_id_1_start_time_1_end_time_1"
+        ),
+    ],
+}
+
+# Indexes superseded by the ones above, dropped before the missing ones are created
+OBSOLETE_INDEXES = {
+    "schedule_links": ["slug_1_userId_1"],
+}
+
+# Upcoming meetings: equality on user_id, then a range scan on scheduled_for
+# that also provides the sort order. The unique variant also stops a slot from
+# being booked twice per advisor, but can only replace the plain one once
+# existing bookings hold no duplicates; see ensure_booking_index().
+BOOKING_INDEX = IndexModel(
+    [("user_id", ASCENDING), ("scheduled_for", ASCENDING)],
+    name="user_id_1_scheduled_for_1"
+)
+UNIQUE_BOOKING_INDEX = IndexModel(
+    [("user_id", ASCENDING), ("scheduled_for", ASCENDING)],
+    unique=True,
+    name="user_id_1_scheduled_for_1_unique"
+)
+
+# MongoDB client, created on first use so the SRV lookup for mongodb+srv://
+# URIs happens inside the worker's startup rather than at import time
+_client: Optional[AsyncMongoClient] = None
+_db: Optional[AsyncDatabase] = None
+
+def _make_client() -> AsyncMongoClient:
+    """Create a new MongoDB client"""
+    return AsyncMongoClient(
+        MONGO_URI,
+        tls=True,
+        tlsCAFile=CA_FILE,
+        connectTimeoutMS=30000,
+        serverSelectionTimeoutMS=7000,
+        socketTimeoutMS=30000,
+        maxPoolSize=MONGO_MAX_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=300000,  # Recycle sockets idle for 5 minutes
+        waitQueueTimeoutMS=5000,  # Fail fast instead of queueing on an exhausted pool
+        compressors="zstd,snappy,zlib",  # Negotiated with the server, first match wins
+        zlibCompressionLevel=-1,
+        retryWrites=True,
+        retryReads=True,
+        event_listeners=[PoolMetricsListener()]
+    )
+
+def get_client() -> Optional[AsyncMongoClient]:
+    """Get the MongoDB client, creating it on first call"""
+    global _client, _db
+    if _client is not None:
+        return _client
 
-# Initialize MongoDB client
-try:
     if not MONGO_URI:
         logger.error("MONGO_URI environment variable is not set")
-        client = None
-        db = None
-    else:
+        return None
+
+    try:
         logger.info("Connecting to MongoDB...")
-        client = AsyncIOMotorClient(
-            MONGO_URI,
-            tls=True,
-            tlsCAFile=certifi.where(),  # Use system CA certificates
-            connectTimeoutMS=30000,
-            serverSelectionTimeoutMS=30000,
-            retryWrites=True,
-            retryReads=True
-        )
-        db = client.get_database("meeting-scheduler")
-        logger.info("MongoDB connected successfully")
-except Exception as e:
-    logger.error(f"MongoDB connection error: {str(e)}")
-    client = None
-    db = None
+        _client = _make_client()
+        _db = _client.get_database("meeting-scheduler")
+        logger.info("MongoDB client created")
+    except Exception as e:
+        logger.error("MongoDB connection error: %s", e)
+        _client = None
+        _db = None
+    return _client
+
+def reset_client():
+    """Forget the current client so the next get_client() call creates a new one.
+
+    Used by gunicorn's post_fork hook: a client created in the master process
+    can't be used by forked workers.
+    """
+    global _client, _db
+    _client = None
+    _db = None
 
 async def verify_connection():
     """Verify MongoDB connection"""
+    client = get_client()
     if not client:
         logger.error("MongoDB client not initialized")
         raise ValueError("MongoDB client not initialized")
 
     try:
-        await client.admin.command('ping')
+        try:
+            await asyncio.wait_for(client.admin.command('ping'), timeout=PING_TIMEOUT)
+        except (asyncio.TimeoutError, ServerSelectionTimeoutError):
+            logger.warning("MongoDB ping timed out, retrying once")
+            await asyncio.wait_for(client.admin.command('ping'), timeout=PING_TIMEOUT)
         logger.info("MongoDB connection verified")
         return True
     except Exception as e:
-        logger.error(f"MongoDB connection verification failed: {str(e)}")
+        logger.error("MongoDB connection verification failed: %s", e)
         raise
 
-def get_db():
+async def warm_pool():
+    """Open minPoolSize connections up front so the first requests don't pay the TLS handshake"""
+    client = get_client()
+    await asyncio.gather(*(client.admin.command('ping') for _ in range(MONGO_MIN_POOL_SIZE)))
+
+def get_db() -> Optional[AsyncDatabase]:
     """Get database instance"""
-    if not db:
+    if get_client() is None:
         logger.error("Database not initialized")
-    return db
+    return _db
+
+async def ensure_indexes():
+    """Create indexes that don't exist yet, one createIndexes command per collection"""
+    db = get_db()
+    for collection_name, indexes in INDEXES.items():
+        existing = {index["name"] async for index in await db[collection_name].list_indexes()}
+
+        for name in OBSOLETE_INDEXES.get(collection_name, []):
+            if name in existing:
+                logger.info("Dropping obsolete index %s on %s", name, collection_name)
+                await db[collection_name].drop_index(name)
+
+        missing = [index for index in indexes if index.document["name"] not in existing]
+        if missing:
+            logger.info("Creating %d index(es) on %s...", len(missing), collection_name)
+            await db[collection_name].create_indexes(missing)
+
+    await ensure_booking_index()
+
+async def ensure_booking_index():
+    """Swap the plain (user_id, scheduled_for) index for the unique one, if the data allows it.
+
+    Bookings made before the unique index existed may hold duplicate slots.
+    While they do, the plain index stays and book_meeting's duplicate check
+    is all that prevents double bookings.
+    """
+    collection = get_db()["scheduled_events"]
+    plain_name = BOOKING_INDEX.document["name"]
+    unique_name = UNIQUE_BOOKING_INDEX.document["name"]
+    existing = {index["name"] async for index in await collection.list_indexes()}
+
+    if unique_name in existing:
+        if plain_name in existing:
+            await collection.drop_index(plain_name)
+        return
+
+    cursor = await collection.aggregate([
+        {"$group": {
+            "_id": {"user_id": "$user_id", "scheduled_for": "$scheduled_for"},
+            "count": {"$sum": 1}
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": 1}
+    ])
+    duplicates = await cursor.to_list(length=1)
+    if duplicates:
+        logger.error(
+            "scheduled_events holds duplicate bookings (e.g. %s); keeping the non-unique "
+            "index %s until they are removed", duplicates[0]["_id"], plain_name
+        )
+        if plain_name not in existing:
+            await collection.create_indexes([BOOKING_INDEX])
+        return
+
+    # Dropped first: MongoDB refuses a second index on the same keys
+    if plain_name in existing:
+        logger.info("Replacing index %s on scheduled_events with %s", plain_name, unique_name)
+        await collection.drop_index(plain_name)
+    try:
+        await collection.create_indexes([UNIQUE_BOOKING_INDEX])
+    except OperationFailure as e:
+        # A duplicate booked between the check above and the build
+        logger.error("Failed to create %s, restoring %s: %s", unique_name, plain_name, e)
+        await collection.create_indexes([BOOKING_INDEX])
 
 async def init_db():
     """Initialize database collections and indexes"""
-    if client is None or db is None:
+    if get_db() is None:
         logger.error("Database not initialized")
         raise ValueError("Database not initialized")
         
     try:
         await verify_connection()
-        logger.info("Creating database indexes...")
-        await db.schedule_links.create_index(
-            [("slug", 1), ("userId", 1)], 
-            unique=True
-        )
+        await warm_pool()
+        with open(INDEX_LOCK_PATH, "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.info("Index setup is running in another worker, skipping")
+            else:
+                await ensure_indexes()
         logger.info("Database initialization complete")
     except Exception as e:
-        logger.error(f"Database initialization failed: {str(e)}")
+        logger.error("Database initialization failed: %s", e)
         raise
 
 # Initialize database if run directly
 if __name__ == "__main__":
-    import asyncio
-    if client and db:
+    if get_client():
         asyncio.run(init_db())
     else:
         logger.error("Cannot initialize database - client or db not initialized")
@@ -0,0 +1,54 @@
+from pymongo import monitoring
+from prometheus_client import Counter, Gauge
+
+# Connection pool metrics, exposed on /metrics so pool saturation is visible
+# before requests start failing on waitQueueTimeoutMS
+POOL_IN_USE = Gauge(
+    "mongo_pool_connections_in_use",
+    "MongoDB connections currently checked out of the pool"
+)
+POOL_OPEN = Gauge(
+    "mongo_pool_connections_open",
+    "MongoDB connections currently open"
+)
+POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total",
+    "Failed MongoDB connection checkouts",
+    ["reason"]
+)
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Track connection pool usage in Prometheus metrics"""
+
+    def connection_checked_out(self, event):
+        POOL_IN_USE.inc()
+
+    def connection_checked_in(self, event):
+        POOL_IN_USE.dec()
+
+    def connection_check_out_failed(self, event):
+        POOL_CHECKOUT_FAILURES.labels(reason=event.reason).inc()
+
+    def connection_created(self, event):
+        POOL_OPEN.inc()
+
+    def connection_closed(self, event):
+        POOL_OPEN.dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
@@ -1,4 +1,3 @@
-import multiprocessing
 import os
 
 # Server socket
@@ -6,10 +5,37 @@ bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
 backlog = 2048
 
 # Worker processes
-# For Fly.io free tier (1GB RAM), we'll use a more conservative worker count
-workers = min(multiprocessing.cpu_count() + 1, 2)  # Max 2 workers for free tier
-worker_class = "uvicorn.workers.UvicornWorker"
-worker_connections = 1000
+def _cpus():
+    """CPUs available to this container.
+
+    multiprocessing.cpu_count() reports the host's CPUs on Fly.io/Render/Docker,
+    so prefer the cgroup v2 quota and fall back to the scheduler affinity mask.
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(quota) // int(period))
+    except Exception:
+        pass
+    return len(os.sched_getaffinity(0))
+
+# For Fly.io free tier (1GB RAM), we'll use a more conservative worker count.
+# WEB_CONCURRENCY overrides it on larger machines.
+workers = int(os.getenv("WEB_CONCURRENCY", min(_cpus() + 1, 2)))  # Max 2 workers for free tier
+worker_class = "workers.UvloopWorker"  # Per-worker concurrency cap lives in workers.py
+
+# MongoDB connection budget
+# Each worker holds its own MongoDB connection pool, so the cluster sees
+# workers * maxPoolSize connections. Keep that under the cluster limit:
+#   per_worker = floor(cluster_conn_limit / workers)
+mongo_connection_limit = int(os.getenv("MONGO_CONNECTION_LIMIT", "500"))  # Atlas M0/M2/M5 limit
+mongo_max_pool_size = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+if workers * mongo_max_pool_size > mongo_connection_limit:
+    mongo_max_pool_size = max(1, mongo_connection_limit // workers)
+    os.environ["MONGO_MAX_POOL_SIZE"] = str(mongo_max_pool_size)
+    if int(os.getenv("MONGO_MIN_POOL_SIZE", "5")) > mongo_max_pool_size:
+        os.environ["MONGO_MIN_POOL_SIZE"] = str(mongo_max_pool_size)
 
 # Timeouts
 timeout = 120  # Increased for long-running async operations
@@ -42,11 +68,6 @@ max_requests = 1000  # Restart workers after this many requests
 max_requests_jitter = 50  # Add randomness to max_requests
 worker_tmp_dir = "/dev/shm"  # Use RAM for temporary files
 
-# Async settings
-worker_class = "uvicorn.workers.UvicornWorker"
-worker_connections = 1000
-keepalive = 5
-
 # Preload app
 preload_app = True
 
@@ -55,6 +76,15 @@ def on_starting(server):
     """Log when the server is starting"""
     server.log.info("Starting meeting-scheduler-api server")
 
+def post_fork(server, worker):
+    """Make each worker build its own MongoDB client.
+
+    With preload_app the master imports the app before forking, and the async
+    client's connections must not be shared across processes.
+    """
+    from db import mongo
+    mongo.reset_client()
+
 def on_exit(server):
     """Log when the server is exiting"""
     server.log.info("Stopping meeting-scheduler-api server") 
\ No newline at end of file
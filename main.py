@@ -1,18 +1,71 @@
-from fastapi import FastAPI, HTTPException, Request, Depends
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from authlib.integrations.starlette_client import OAuth
-from starlette.middleware.sessions import SessionMiddleware
+from prometheus_client import Counter, make_asgi_app
+from middleware.db_gate import DBRequiredMiddleware
+from middleware.session import LazySessionMiddleware
+from contextlib import asynccontextmanager
+import asyncio
+import logging
+import orjson
 import os
 from dotenv import load_dotenv
-from routes import init_routes
-from db.mongo import init_db, client
 
+# Load environment variables once, before any module below reads them
+load_dotenv()
 
-app = FastAPI()
+from routes import init_routes
+from routes.responses import ORJSONResponse
+from services.http_client import close_http_client
+from services.user_db import invalidate_user
+from db.mongo import init_db, get_client
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds between MongoDB initialization attempts after a failure
+DB_INIT_RETRY_DELAY = 5
+
+async def prefetch_oauth_metadata():
+    """Load Google's OpenID configuration now instead of on the first login"""
+    google = oauth.create_client("google")
+    if not google:
+        return
+    try:
+        await google.load_server_metadata()
+    except Exception as e:
+        # Authlib fetches it again lazily on the first login
+        logger.warning("Failed to prefetch Google OAuth metadata: %s", e)
+
+async def connect_db_in_background():
+    """Initialize MongoDB without holding up startup, retrying until it succeeds"""
+    global db_connected
+    while True:
+        try:
+            await init_db()
+            db_connected = True
+            return
+        except Exception as e:
+            logger.error("MongoDB initialization failed, retrying in %ss: %s", DB_INIT_RETRY_DELAY, e)
+            await asyncio.sleep(DB_INIT_RETRY_DELAY)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create the MongoDB client here, inside the worker, rather than at import.
+    # The worker starts serving right away; routes are registered at import and
+    # DBRequiredMiddleware answers 503 for the database-backed ones until the
+    # background initialization below has finished.
+    tasks = [asyncio.create_task(prefetch_oauth_metadata())]
+    if get_client():
+        tasks.append(asyncio.create_task(connect_db_in_background()))
+    yield
+    for task in tasks:
+        task.cancel()
+    await close_http_client()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
-# Load environment variables
-load_dotenv()
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 SECRET_KEY = os.getenv("SECRET_KEY")
 
@@ -22,24 +75,54 @@ if not FRONTEND_URL:
 if not SECRET_KEY:
     raise RuntimeError("SECRET_KEY is not set in .env")
 
-# Simple session middleware
+# Database-backed routers answer 503 until MongoDB is ready
 app.add_middleware(
-    SessionMiddleware,
+    DBRequiredMiddleware,
+    is_ready=lambda: db_connected,
+    path_prefixes=("/auth", "/availability", "/events", "/meetings", "/public", "/schedule-links"),
+)
+
+# Signed-cookie session middleware; the status and metrics endpoints never
+# touch the session, so they skip it entirely
+app.add_middleware(
+    LazySessionMiddleware,
     secret_key=SECRET_KEY,
     max_age=14 * 24 * 60 * 60,
     same_site="none",
     https_only=True,
+    skip_paths=("/", "/metrics", "/metrics/"),
 )
 
-# CORS middleware
+# CORS middleware. It is added last, so it is outermost and answers preflight
+# requests before the session middleware runs; browsers may cache a preflight
+# for up to 2 hours (Chromium's cap), which saves an OPTIONS round-trip per call
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[FRONTEND_URL],
+    allow_origins=frozenset({FRONTEND_URL}),
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=2 * 60 * 60,
 )
 
+
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    """Answer unexpected errors with a generic 500 instead of per-route try/except blocks"""
+    # Exception handlers run in ServerErrorMiddleware, outside CORSMiddleware, so
+    # the CORS headers are added here for the frontend to be able to read the error.
+    # Starlette re-raises exc afterwards, so the server still logs the traceback.
+    headers = None
+    if request.headers.get("origin") == FRONTEND_URL:
+        headers = {
+            "Access-Control-Allow-Origin": FRONTEND_URL,
+            "Access-Control-Allow-Credentials": "true",
+            "Vary": "Origin",
+        }
+    return ORJSONResponse({"detail": "Internal server error"}, status_code=500, headers=headers)
+
+
+app.add_exception_handler(Exception, unhandled_exception_handler)
+
 # Configure OAuth
 oauth = OAuth()
 google_client_id = os.getenv("GOOGLE_CLIENT_ID")
@@ -57,34 +140,40 @@ if google_client_id and google_client_secret:
         }
     )
 
+init_routes(app, oauth)
+
 db_connected = False
 
-@app.on_event("startup")
-async def startup():
-    global db_connected
-    if client:
-        await init_db()
-        db_connected = True
-        init_routes(app, oauth)
+# Probes to / are counted here rather than written to the access log
+STATUS_CHECKS = Counter("status_checks_total", "Requests to the / status endpoint")
+
+# The status payload only depends on db_connected, so serialize both variants once
+_STATUS_CONNECTED = orjson.dumps({"status": "ok", "db_connected": True})
+_STATUS_DISCONNECTED = orjson.dumps({"status": "ok", "db_connected": False})
 
-def require_db():
-    if not db_connected:
-        raise HTTPException(status_code=503, detail="Database not available")
-    return True
+# Prometheus metrics (MongoDB connection pool usage)
+app.mount("/metrics", make_asgi_app())
 
-@app.get("/")
+@app.get("/", response_class=Response, include_in_schema=False)
 async def root():
-    return {"status": "ok", "db_connected": db_connected}
+    STATUS_CHECKS.inc()
+    return Response(
+        _STATUS_CONNECTED if db_connected else _STATUS_DISCONNECTED,
+        media_type="application/json",
+    )
 
 @app.get("/me")
-async def get_user(request: Request, _=Depends(require_db)):
+async def get_user(request: Request):
     user = request.session.get('user')
     if not user:
         raise HTTPException(status_code=401, detail="Not authenticated")
     return user
 
 @app.post("/logout")
-async def logout(request: Request, _=Depends(require_db)):
+async def logout(request: Request):
+    user = request.session.get('user')
+    if user:
+        invalidate_user(user.get('email'))
     request.session.clear()
     return {"message": "Successfully logged out"}
 
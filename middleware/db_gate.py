@@ -0,0 +1,31 @@
+from typing import Callable, Iterable
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_UNAVAILABLE_BODY = orjson.dumps({"detail": "Database not available"})
+_UNAVAILABLE_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_UNAVAILABLE_BODY)).encode("latin-1")),
+]
+
+
+class DBRequiredMiddleware:
+    """Answers 503 for database-backed paths until MongoDB is ready.
+
+    Checking once at the ASGI boundary keeps handlers free of a per-route
+    dependency; they can call get_db() and rely on it being initialized.
+    """
+
+    def __init__(self, app: ASGIApp, is_ready: Callable[[], bool], path_prefixes: Iterable[str]) -> None:
+        self.app = app
+        self.is_ready = is_ready
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not self.is_ready() and scope["path"].startswith(self.path_prefixes):
+            await send({"type": "http.response.start", "status": 503, "headers": _UNAVAILABLE_HEADERS})
+            await send({"type": "http.response.body", "body": _UNAVAILABLE_BODY})
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,127 @@
+import json
+from base64 import b64decode, b64encode
+from collections.abc import MutableMapping
+from typing import Any, Iterable, Optional
+
+import itsdangerous
+from itsdangerous.exc import BadSignature
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class LazySession(MutableMapping):
+    """Session dict that only verifies and decodes the cookie on first access"""
+
+    __slots__ = ("_cookie", "_signer", "_max_age", "_data", "dirty")
+
+    def __init__(self, cookie: Optional[str], signer: itsdangerous.TimestampSigner, max_age: Optional[int]):
+        self._cookie = cookie
+        self._signer = signer
+        self._max_age = max_age
+        self._data: Optional[dict] = None
+        self.dirty = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is not None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            self._data = {}
+            if self._cookie:
+                try:
+                    data = self._signer.unsign(self._cookie.encode("utf-8"), max_age=self._max_age)
+                    self._data = json.loads(b64decode(data))
+                except BadSignature:
+                    pass
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._load()[key] = value
+        self.dirty = True
+
+    def __delitem__(self, key: str) -> None:
+        del self._load()[key]
+        self.dirty = True
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._load()
+
+    def clear(self) -> None:
+        # No need to verify a cookie we're about to throw away
+        self._data = {}
+        self.dirty = True
+
+    def encode(self, signer: itsdangerous.TimestampSigner) -> str:
+        return signer.sign(b64encode(json.dumps(self._data).encode("utf-8"))).decode("utf-8")
+
+
+class LazySessionMiddleware:
+    """Signed-cookie session middleware, cookie-compatible with Starlette's SessionMiddleware.
+
+    The cookie is only verified when a handler reads the session, it is only
+    re-signed when the session was modified, and paths in ``skip_paths`` get no
+    session at all.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret_key: str,
+        session_cookie: str = "session",
+        max_age: Optional[int] = 14 * 24 * 60 * 60,  # 14 days, in seconds
+        path: str = "/",
+        same_site: str = "lax",
+        https_only: bool = False,
+        skip_paths: Iterable[str] = (),
+    ) -> None:
+        self.app = app
+        self.signer = itsdangerous.TimestampSigner(str(secret_key))
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.max_age_flag = f"Max-Age={max_age}; " if max_age else ""
+        self.skip_paths = frozenset(skip_paths)
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:  # Secure flag can be used with HTTPS only
+            self.security_flags += "; secure"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket") or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        cookie = HTTPConnection(scope).cookies.get(self.session_cookie)
+        session = LazySession(cookie, self.signer, self.max_age)
+        scope["session"] = session
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and session.loaded:
+                headers = MutableHeaders(scope=message)
+                headers.add_vary_header("Cookie")
+                if session.dirty and session:
+                    headers.append(
+                        "Set-Cookie",
+                        f"{self.session_cookie}={session.encode(self.signer)}; path={self.path}; "
+                        f"{self.max_age_flag}{self.security_flags}"
+                    )
+                elif session.dirty and cookie:
+                    # The session has been cleared
+                    headers.append(
+                        "Set-Cookie",
+                        f"{self.session_cookie}=null; path={self.path}; "
+                        f"expires=Thu, 01 Jan 1970 00:00:00 GMT; {self.security_flags}"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
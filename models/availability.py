@@ -1,7 +1,7 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, field_validator
 from typing import List
-from datetime import time
 from enum import Enum
+from functools import cached_property
 
 class Weekday(str, Enum):
     MONDAY = "monday"
@@ -14,13 +14,32 @@ class Weekday(str, Enum):
 
 class AvailabilityWindow(BaseModel):
     weekday: Weekday
-    start_time: str = Field(..., pattern=r"^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$")
-    end_time: str = Field(..., pattern=r"^([0-1]?[0-9]|2[0-3]):[0-5][0-9]$")
+    start_time: str
+    end_time: str
+
+    @field_validator('start_time', 'end_time')
+    @classmethod
+    def validate_clock_time(cls, v):
+        # Accept "H:MM" or "HH:MM" and normalize to "HH:MM"
+        hours, sep, minutes = v.partition(':')
+        if not (sep and 1 <= len(hours) <= 2 and len(minutes) == 2
+                and (hours + minutes).isascii() and (hours + minutes).isdigit()):
+            raise ValueError('Time must be in HH:MM format')
+        if int(hours) > 23 or int(minutes) > 59:
+            raise ValueError('Time must be in HH:MM format')
+        return hours.zfill(2) + ':' + minutes
+
+    # Both times are normalized "HH:MM"; parse each once into minutes of the day
+    @cached_property
+    def start_minutes(self) -> int:
+        return int(self.start_time[:2]) * 60 + int(self.start_time[3:])
+
+    @cached_property
+    def end_minutes(self) -> int:
+        return int(self.end_time[:2]) * 60 + int(self.end_time[3:])
 
     def validate_times(self):
-        start = time.fromisoformat(self.start_time)
-        end = time.fromisoformat(self.end_time)
-        if start >= end:
+        if self.start_minutes >= self.end_minutes:
             raise ValueError("start_time must be before end_time")
         return True
 
@@ -28,6 +47,4 @@ class AvailabilityRequest(BaseModel):
     windows: List[AvailabilityWindow]
 
     def validate_all(self):
-        for window in self.windows:
-            window.validate_times()
-        return True
+        return all(window.validate_times() for window in self.windows)
@@ -1,6 +1,10 @@
 from pydantic import BaseModel, Field
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
+
+# Timezone-aware replacement for the deprecated datetime.utcnow
+_utcnow = partial(datetime.now, timezone.utc)
 
 class Event(BaseModel):
     id: str = Field(..., description="Event ID from Google Calendar")
@@ -11,8 +15,8 @@ class Event(BaseModel):
     end_time: datetime = Field(..., description="Event end time")
     location: Optional[str] = Field(None, description="Event location")
     status: str = Field(..., description="Event status (confirmed, tentative, cancelled)")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
 
 class Calendar(BaseModel):
     id: str = Field(..., description="Calendar ID from Google")
@@ -24,5 +28,5 @@ class Calendar(BaseModel):
     is_read_only: bool = Field(..., description="Whether the calendar is read-only")
     access_token: str = Field(..., description="Google OAuth access token")
     refresh_token: Optional[str] = Field(None, description="Google OAuth refresh token")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
\ No newline at end of file
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
\ No newline at end of file
@@ -1,7 +1,11 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from datetime import date, datetime
 import json
+import re
+
+# Allow only letters, numbers, hyphens, and underscores
+_SLUG_RE = re.compile(r'^[a-zA-Z0-9\-_]+$')
 
 class DateEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -17,29 +21,12 @@ class ScheduleLink(BaseModel):
     maxDaysInAdvance: int = Field(30, gt=0)
     customQuestions: List[str] = []
 
-    @validator('slug')
+    @field_validator('slug')
+    @classmethod
     def validate_slug(cls, v):
-        # Allow only letters, numbers, hyphens, and underscores
-        import re
-        if not re.match(r'^[a-zA-Z0-9\-_]+$', v):
+        if not _SLUG_RE.match(v):
             raise ValueError('Slug must contain only letters, numbers, hyphens and underscores')
         return v.lower()  # Convert to lowercase for consistency
-    
-    @validator('expirationDate')
-    def convert_expiration_date(cls, v):
-        # Convert string date to datetime.date if needed
-        if isinstance(v, str):
-            try:
-                return datetime.fromisoformat(v).date()
-            except ValueError:
-                raise ValueError('Invalid date format, use YYYY-MM-DD')
-        return v
-    
-    class Config:
-        json_encoders = {
-            date: lambda v: v.isoformat(),
-            datetime: lambda v: v.isoformat()
-        }
 
 class ScheduleLinkRequest(BaseModel):
     links: List[ScheduleLink]
@@ -56,9 +43,3 @@ class ScheduleLinkResponse(BaseModel):
     createdAt: datetime
     updatedAt: datetime
     uses: int = 0
-    
-    class Config:
-        json_encoders = {
-            date: lambda v: v.isoformat(),
-            datetime: lambda v: v.isoformat()
-        } 
\ No newline at end of file
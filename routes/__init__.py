@@ -18,7 +18,7 @@ def init_routes(app: FastAPI, oauth_client):
     app.include_router(calendar_router)
     
     # Initialize events routes
-    events_router = init_events_routes(oauth_client)
+    events_router = init_events_routes()
     app.include_router(events_router)
     
     # Initialize availability routes
@@ -1,15 +1,15 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import RedirectResponse
-import httpx
+from routes.dependencies import require_user
+from routes.responses import ORJSONResponse
 import os
 import logging
-from services.user_db import UserService
-from urllib.parse import urljoin
-from datetime import datetime
+from services.user_db import UserService, invalidate_user
+from services.http_client import get_http_client
+from urllib.parse import urlencode, quote
 import secrets
 
-# Logging setup
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -21,82 +21,95 @@ HUBSPOT_CLIENT_ID = os.getenv("HUBSPOT_CLIENT_ID")
 HUBSPOT_CLIENT_SECRET = os.getenv("HUBSPOT_CLIENT_SECRET")
 HUBSPOT_SCOPES = "crm.objects.contacts.read crm.objects.contacts.write"
 
+# OAuth and frontend redirect URLs only depend on configuration, so build them once
+DASHBOARD_URL = f"{FRONTEND_URL}/dashboard"
+AUTH_FAILED_URL = f"{FRONTEND_URL}/?error=auth_failed"
+NOT_AUTHENTICATED_URL = f"{DASHBOARD_URL}?error=not_authenticated"
+HUBSPOT_CONNECTED_URL = f"{DASHBOARD_URL}?success=hubspot_connected"
+HUBSPOT_TOKEN_FAILED_URL = f"{DASHBOARD_URL}?error=token_exchange_failed"
+HUBSPOT_PORTAL_FAILED_URL = f"{DASHBOARD_URL}?error=portal_fetch_failed"
+GOOGLE_REDIRECT_URI = f"{BACKEND_URL}/auth/google/callback"
+HUBSPOT_REDIRECT_URI = f"{BACKEND_URL}/auth/hubspot/callback"
+HUBSPOT_AUTH_URL = "https://app.hubspot.com/oauth/authorize?" + urlencode(
+    {"client_id": HUBSPOT_CLIENT_ID, "redirect_uri": HUBSPOT_REDIRECT_URI, "scope": HUBSPOT_SCOPES},
+    quote_via=quote,
+)
+
 def init_auth_routes(oauth_client):
     user_service = UserService()
 
     @router.get("/google")
     async def google_auth(request: Request):
         try:
-            redirect_uri = f"{BACKEND_URL}/auth/google/callback"
             state = secrets.token_urlsafe(16)
             request.session['oauth_state'] = state
 
             return await oauth_client.google.authorize_redirect(
                 request,
-                redirect_uri,
+                GOOGLE_REDIRECT_URI,
                 access_type='offline',
                 prompt='consent',
                 state=state
             )
         except Exception as e:
-            logger.error(f"Google auth error: {str(e)}")
-            return RedirectResponse(url=f'{FRONTEND_URL}/?error=auth_failed')
+            logger.error("Google auth error: %s", e)
+            return RedirectResponse(url=AUTH_FAILED_URL)
 
     @router.get("/google/callback")
     async def google_callback(request: Request):
         try:
             token = await oauth_client.google.authorize_access_token(request)
 
-            async with httpx.AsyncClient() as client:
-                userinfo_response = await client.get(
-                    "https://www.googleapis.com/oauth2/v2/userinfo",
-                    headers={"Authorization": f"Bearer {token['access_token']}"}
-                )
-                if not userinfo_response.is_success:
-                    raise Exception("Failed to get user info")
-
-                userinfo = userinfo_response.json()
-
-                user = await user_service.create_or_update_google_user(
-                    email=userinfo["email"],
-                    google_id=userinfo["id"],
-                    tokens={
-                        "access_token": token['access_token'],
-                        "refresh_token": token.get('refresh_token'),
-                        "expires_in": token.get('expires_in', 3600)
-                    }
-                )
-
-                request.session["user"] = {
-                    "email": user["email"],
-                    "name": userinfo.get("name"),
-                    "picture": userinfo.get("picture")
+            client = get_http_client()
+            userinfo_response = await client.get(
+                "https://www.googleapis.com/oauth2/v2/userinfo",
+                headers={"Authorization": f"Bearer {token['access_token']}"}
+            )
+            if not userinfo_response.is_success:
+                raise Exception("Failed to get user info")
+
+            userinfo = userinfo_response.json()
+
+            user = await user_service.create_or_update_google_user(
+                email=userinfo["email"],
+                google_id=userinfo["id"],
+                tokens={
+                    "access_token": token['access_token'],
+                    "refresh_token": token.get('refresh_token'),
+                    "expires_in": token.get('expires_in', 3600)
                 }
+            )
+
+            request.session["user"] = {
+                "email": user["email"],
+                "name": userinfo.get("name"),
+                "picture": userinfo.get("picture")
+            }
 
-                return RedirectResponse(url=f"{FRONTEND_URL}/dashboard")
+            return RedirectResponse(url=DASHBOARD_URL)
         except Exception as e:
-            logger.error(f"Callback error: {str(e)}")
-            return RedirectResponse(url=f'{FRONTEND_URL}/?error=auth_failed')
+            logger.error("Callback error: %s", e)
+            return RedirectResponse(url=AUTH_FAILED_URL)
 
     @router.get("/me")
-    async def get_current_user(request: Request):
-        user = request.session.get("user")
-        if not user:
-            raise HTTPException(status_code=401, detail="Not authenticated")
-
+    async def get_current_user(user: dict = Depends(require_user)):
         user_data = await user_service.get_user_by_email(user['email'])
         if not user_data:
             raise HTTPException(status_code=404, detail="User not found")
 
-        return {
+        # _id is already a string and orjson encodes the datetimes natively,
+        # so skip FastAPI's jsonable_encoder pass
+        return ORJSONResponse({
             **user_data,
             "name": user.get('name'),
             "picture": user.get('picture')
-        }
+        })
 
     @router.post("/logout")
     async def logout(request: Request):
-        request.session.pop("user", None)
+        user = request.session.pop("user", None)
+        if user:
+            invalidate_user(user.get("email"))
         return {"message": "Logged out successfully"}
 
     # Optional: Keep HubSpot if you're using it
@@ -104,68 +117,60 @@ def init_auth_routes(oauth_client):
     async def hubspot_auth(request: Request):
         user = request.session.get("user")
         if not user:
-            return RedirectResponse(url=f'{FRONTEND_URL}/dashboard?error=not_authenticated')
-
-        redirect_uri = f"{BACKEND_URL}/auth/hubspot/callback"
-        auth_url = (
-            f"https://app.hubspot.com/oauth/authorize"
-            f"?client_id={HUBSPOT_CLIENT_ID}"
-            f"&redirect_uri={redirect_uri}"
-            f"&scope={HUBSPOT_SCOPES}"
-        )
+            return RedirectResponse(url=NOT_AUTHENTICATED_URL)
 
-        return RedirectResponse(url=auth_url)
+        return RedirectResponse(url=HUBSPOT_AUTH_URL)
 
     @router.get("/hubspot/callback")
     async def hubspot_callback(request: Request, code: str):
         user = request.session.get("user")
         if not user:
-            return RedirectResponse(url=f'{FRONTEND_URL}/dashboard?error=not_authenticated')
-
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                "https://api.hubapi.com/oauth/v1/token",
-                data={
-                    "grant_type": "authorization_code",
-                    "client_id": HUBSPOT_CLIENT_ID,
-                    "client_secret": HUBSPOT_CLIENT_SECRET,
-                    "redirect_uri": f"{BACKEND_URL}/auth/hubspot/callback",
-                    "code": code
-                }
-            )
+            return RedirectResponse(url=NOT_AUTHENTICATED_URL)
+
+        client = get_http_client()
+        token_response = await client.post(
+            "https://api.hubapi.com/oauth/v1/token",
+            data={
+                "grant_type": "authorization_code",
+                "client_id": HUBSPOT_CLIENT_ID,
+                "client_secret": HUBSPOT_CLIENT_SECRET,
+                "redirect_uri": HUBSPOT_REDIRECT_URI,
+                "code": code
+            }
+        )
 
-            if not token_response.is_success:
-                return RedirectResponse(url=f"{FRONTEND_URL}/dashboard?error=token_exchange_failed")
+        if not token_response.is_success:
+            return RedirectResponse(url=HUBSPOT_TOKEN_FAILED_URL)
 
-            token_data = token_response.json()
+        token_data = token_response.json()
 
-            portal_response = await client.get(
-                f"https://api.hubapi.com/oauth/v1/access-tokens/{token_data['access_token']}"
-            )
+        portal_response = await client.get(
+            f"https://api.hubapi.com/oauth/v1/access-tokens/{token_data['access_token']}"
+        )
 
-            if not portal_response.is_success:
-                return RedirectResponse(url=f"{FRONTEND_URL}/dashboard?error=portal_fetch_failed")
+        if not portal_response.is_success:
+            return RedirectResponse(url=HUBSPOT_PORTAL_FAILED_URL)
 
-            portal_data = portal_response.json()
+        portal_data = portal_response.json()
 
-            await user_service.update_hubspot_tokens(
-                email=user["email"],
-                tokens={
-                    "access_token": token_data["access_token"],
-                    "refresh_token": token_data.get("refresh_token"),
-                    "expires_in": token_data.get("expires_in"),
-                    "portal_id": portal_data["hub_id"],
-                    "portal_name": portal_data["hub_domain"]
-                }
-            )
+        await user_service.update_hubspot_tokens(
+            email=user["email"],
+            tokens={
+                "access_token": token_data["access_token"],
+                "refresh_token": token_data.get("refresh_token"),
+                "expires_in": token_data.get("expires_in"),
+                "portal_id": portal_data["hub_id"],
+                "portal_name": portal_data["hub_domain"]
+            }
+        )
 
-        return RedirectResponse(url=f"{FRONTEND_URL}/dashboard?success=hubspot_connected")
+        return RedirectResponse(url=HUBSPOT_CONNECTED_URL)
 
     @router.get("/hubspot/connection")
     async def hubspot_connection(request: Request):
         user = request.session.get("user")
         if not user:
-            return RedirectResponse(url=f"{FRONTEND_URL}/dashboard?error=not_authenticated")
+            return RedirectResponse(url=NOT_AUTHENTICATED_URL)
 
         return await user_service.get_hubspot_connection(user["email"])
 
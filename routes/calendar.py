@@ -1,21 +1,26 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.responses import RedirectResponse
+from routes.dependencies import require_user
+from routes.responses import cacheable_json
 from services.calendar_service import CalendarService
-from services.event_db import EventDBService
 import os
 import logging
+from urllib.parse import quote
 from datetime import datetime, timedelta
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth/google/calendar", tags=["calendar"])
 FRONTEND_URL = os.getenv("FRONTEND_URL")
 
+# Frontend redirect URLs, built once since FRONTEND_URL never changes at runtime
+NOT_AUTHENTICATED_URL = f"{FRONTEND_URL}/dashboard?error=not_authenticated"
+CALENDAR_CONNECTED_URL = f"{FRONTEND_URL}/dashboard?success=true"
+CALENDAR_AUTH_FAILED_URL = f"{FRONTEND_URL}/dashboard?error=calendar_auth_failed&message="
+
 def init_calendar_routes(oauth_client):
     calendar_service = CalendarService(oauth_client)
-    event_db = EventDBService()
 
     @router.get("")
     async def google_calendar_auth(request: Request):
@@ -24,10 +29,10 @@ def init_calendar_routes(oauth_client):
         user = request.session.get('user')
         if not user:
             logger.error("No user found in session during calendar auth")
-            return RedirectResponse(url=f'{FRONTEND_URL}/dashboard?error=not_authenticated')
+            return RedirectResponse(url=NOT_AUTHENTICATED_URL)
             
         redirect_uri = request.url_for('calendar_callback')
-        logger.info(f"Starting calendar OAuth flow for user {user.get('email')} with redirect URI: {redirect_uri}")
+        logger.info("Starting calendar OAuth flow for user %s with redirect URI: %s", user.get('email'), redirect_uri)
         return await oauth_client.google.authorize_redirect(
             request, 
             redirect_uri,
@@ -43,51 +48,51 @@ def init_calendar_routes(oauth_client):
             user = request.session.get('user')
             if not user:
                 logger.error("No user found in session during calendar callback")
-                return RedirectResponse(url=f'{FRONTEND_URL}/dashboard?error=not_authenticated')
+                return RedirectResponse(url=NOT_AUTHENTICATED_URL)
 
             user_email = user.get('email')
-            logger.info(f"Starting calendar callback process for user {user_email}")
+            logger.info("Starting calendar callback process for user %s", user_email)
             
             token = await oauth_client.google.authorize_access_token(request)
             logger.info("Successfully obtained access token")
-            logger.info(f"Token scopes: {token.get('scope', '').split()}")
+            logger.info("Token scopes: %s", token.get('scope', '').split())
             
             calendar_details = await calendar_service.get_calendars(token, user_email)
-            logger.info(f"Retrieved {len(calendar_details)} calendars")
+            logger.info("Retrieved %d calendars", len(calendar_details))
             if calendar_details:
-                logger.info(f"First calendar details: {calendar_details[0]}")
+                logger.info("First calendar details: %s", calendar_details[0])
             
             # Redirect with success parameter
-            redirect_url = f'{FRONTEND_URL}/dashboard?success=true'
-            logger.info(f"Redirecting to: {redirect_url}")
-            return RedirectResponse(url=redirect_url)
+            logger.info("Redirecting to: %s", CALENDAR_CONNECTED_URL)
+            return RedirectResponse(url=CALENDAR_CONNECTED_URL)
             
         except Exception as e:
-            logger.error(f"Calendar auth callback error: {str(e)}")
-            logger.error(f"Full exception details: {repr(e)}")
+            logger.error("Calendar auth callback error: %s", e)
+            logger.error("Full exception details: %r", e)
             return RedirectResponse(
-                url=f'{FRONTEND_URL}/dashboard?error=calendar_auth_failed&message={str(e)}'
+                url=CALENDAR_AUTH_FAILED_URL + quote(str(e))
             )
 
     @router.get("/list")
-    async def list_calendars(request: Request):
+    async def list_calendars(request: Request, user: dict = Depends(require_user)):
         """Get list of connected calendars"""
         try:
-            user = request.session.get('user')
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
-            
             user_email = user.get('email')
-            logger.info(f"Calendar list request for user {user_email}")
+            logger.debug("Calendar list request for user %s", user_email)
             
-            # Get calendars from database first
+            # A recent answer, including "no calendars", skips the database and Google
+            calendars = calendar_service.get_cached_calendars(user_email)
+            if calendars is not None:
+                return cacheable_json(request, calendars)
+            
+            # Get calendars from database
             try:
                 calendars = await calendar_service.get_stored_calendars(user_email)
                 if calendars:
-                    logger.info(f"Retrieved {len(calendars)} calendars from database for user {user_email}")
-                    return calendars
+                    logger.debug("Retrieved %d calendars from database for user %s", len(calendars), user_email)
+                    return cacheable_json(request, calendars)
             except Exception as e:
-                logger.warning(f"Failed to get calendars from database: {str(e)}")
+                logger.warning("Failed to get calendars from database: %s", e)
             
             # If no calendars in database or error, fetch from Google
             token = request.session.get('google_token')
@@ -95,22 +100,18 @@ def init_calendar_routes(oauth_client):
                 raise HTTPException(status_code=401, detail="No Google token found")
             
             calendars = await calendar_service.get_calendars(token, user_email)
-            logger.info(f"Retrieved {len(calendars)} calendars from Google for user {user_email}")
-            return calendars
+            logger.info("Retrieved %d calendars from Google for user %s", len(calendars), user_email)
+            return cacheable_json(request, calendars)
         except Exception as e:
-            logger.error(f"Error listing calendars: {str(e)}")
+            logger.error("Error listing calendars: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.delete("/{calendar_id}")
-    async def disconnect_calendar(request: Request, calendar_id: str):
+    async def disconnect_calendar(calendar_id: str, user: dict = Depends(require_user)):
         """Disconnect a calendar"""
         try:
-            user = request.session.get('user')
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
-            
             user_email = user.get('email')
-            logger.info(f"Disconnecting calendar {calendar_id} for user {user_email}")
+            logger.info("Disconnecting calendar %s for user %s", calendar_id, user_email)
             
             try:
                 deleted = await calendar_service.disconnect_calendar(calendar_id, user_email)
@@ -126,7 +127,7 @@ def init_calendar_routes(oauth_client):
                 # Log the full error and raise a new HTTP exception
                 error_msg = f"Failed to disconnect calendar: {str(e)}"
                 logger.error(error_msg)
-                logger.error(f"Full exception details: {repr(e)}")
+                logger.error("Full exception details: %r", e)
                 raise HTTPException(status_code=500, detail=error_msg)
         except HTTPException as he:
             # Re-raise HTTP exceptions from the outer try block
@@ -135,7 +136,7 @@ def init_calendar_routes(oauth_client):
             # Handle any other unexpected errors
             error_msg = f"Unexpected error disconnecting calendar: {str(e)}"
             logger.error(error_msg)
-            logger.error(f"Full exception details: {repr(e)}")
+            logger.error("Full exception details: %r", e)
             raise HTTPException(status_code=500, detail=error_msg)
 
     return router
\ No newline at end of file
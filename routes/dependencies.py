@@ -0,0 +1,17 @@
+from fastapi import HTTPException, Request
+import re
+
+# A valid ObjectId string is exactly 24 hex characters
+_OBJECT_ID_RE = re.compile(r'[0-9a-fA-F]{24}')
+
+async def require_user(request: Request) -> dict:
+    """Dependency returning the signed-in user from the session, or a 401"""
+    user = request.session.get("user")
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return user
+
+def is_object_id(value: str) -> bool:
+    """Whether value can be turned into an ObjectId; check ids from requests before bson raises InvalidId"""
+    # fullmatch, since '$' would also accept a trailing newline
+    return _OBJECT_ID_RE.fullmatch(value) is not None
@@ -1,64 +1,62 @@
-from fastapi import APIRouter, Request, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from routes.dependencies import require_user
+from routes.responses import cacheable_json
 from services.event_db import EventDBService
-from services.calendar_service import CalendarService
+from services.calendar_db import CalendarDBService
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/events", tags=["events"])
 
-def init_events_routes(oauth_client):
+# Fields the events endpoint returns; descriptions and locations stay in Mongo
+_EVENT_PROJECTION = {"_id": 0, "id": 1, "summary": 1, "start_time": 1, "end_time": 1, "status": 1}
+
+def init_events_routes():
     event_db = EventDBService()
-    calendar_service = CalendarService(oauth_client)
+    calendar_db = CalendarDBService()
 
     @router.get("/{calendar_id}")
-    async def get_calendar_events(request: Request, calendar_id: str):
+    async def get_calendar_events(calendar_id: str, request: Request, user: dict = Depends(require_user)):
         """Get all events for a calendar"""
         try:
-            # Verify user is authenticated
-            user = request.session.get('user')
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
-            
             user_email = user['email']
-            logger.info(f"Fetching events for calendar {calendar_id} for user {user_email}")
+            logger.debug("Fetching events for calendar %s for user %s", calendar_id, user_email)
 
             # Verify calendar belongs to user
             try:
-                calendar = await calendar_service.calendar_db.get_calendar(calendar_id, user_email)
-                if not calendar:
-                    logger.warning(f"Calendar {calendar_id} not found for user {user_email}")
+                if not await calendar_db.owns_calendar(calendar_id, user_email):
+                    logger.warning("Calendar %s not found for user %s", calendar_id, user_email)
                     return []  # Return empty list instead of 404 for non-existent calendars
             except Exception as e:
-                logger.error(f"Error checking calendar access: {str(e)}")
+                logger.error("Error checking calendar access: %s", e)
                 raise HTTPException(status_code=500, detail="Error checking calendar access")
 
             # Get events from database
             try:
-                events = await event_db.get_calendar_events(calendar_id)
-                logger.info(f"Retrieved {len(events)} events for calendar {calendar_id}")
+                events = await event_db.get_calendar_events(calendar_id, projection=_EVENT_PROJECTION)
+                logger.debug("Retrieved %d events for calendar %s", len(events), calendar_id)
                 
-                # Convert to simple response format
-                return [
+                # Convert to simple response format; orjson formats the datetimes
+                return cacheable_json(request, [
                     {
                         "id": event["id"],
                         "summary": event["summary"],
-                        "start": event["start_time"].isoformat(),
-                        "end": event["end_time"].isoformat(),
+                        "start": event["start_time"],
+                        "end": event["end_time"],
                         "status": event["status"]
                     }
                     for event in events
-                ]
+                ])
             except Exception as e:
-                logger.error(f"Database error fetching events: {str(e)}")
+                logger.error("Database error fetching events: %s", e)
                 raise HTTPException(status_code=500, detail="Database error fetching events")
 
         except HTTPException as he:
             raise he
         except Exception as e:
-            logger.error(f"Unexpected error fetching events: {str(e)}")
+            logger.error("Unexpected error fetching events: %s", e)
             raise HTTPException(status_code=500, detail="Failed to fetch events")
 
     return router
\ No newline at end of file
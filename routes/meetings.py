@@ -1,16 +1,142 @@
-from fastapi import APIRouter, HTTPException, Request
-from db.mongo import db
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from routes.dependencies import is_object_id, require_user
+from routes.responses import PRIVATE_CACHE_CONTROL, cacheable_json
+from db.mongo import get_db
+from services.iso_dates import parse_iso_datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from bson import ObjectId
 import logging
-from typing import List, Dict, Any
+import orjson
+import time
+from typing import List, Dict, Any, AsyncIterator, Optional
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/meetings", tags=["meetings"])
 
+# Meetings read from the cursor per streamed chunk
+MEETINGS_BATCH_SIZE = 100
+
+def _link_lookup(projection: Dict[str, int]) -> Dict[str, Any]:
+    """$lookup stage joining a meeting's scheduling link as a 0- or 1-element "link" array.
+
+    Ids that aren't valid ObjectIds convert to null and simply match nothing.
+    """
+    return {
+        "$lookup": {
+            "from": "schedule_links",
+            "let": {
+                "link_id": {
+                    "$convert": {"input": "$scheduling_link_id", "to": "objectId", "onError": None, "onNull": None}
+                }
+            },
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$link_id"]}}},
+                {"$project": projection}
+            ],
+            "as": "link"
+        }
+    }
+
+# Sorts, joins and trims the matched meetings on the server. Only the fields
+# the list returns come back; the link is reduced to its slug and the
+# enrichment blob to a boolean, so neither crosses the wire.
+_MEETING_LIST_STAGES = [
+    {"$sort": {"scheduled_for": 1}},
+    _link_lookup({"slug": 1}),
+    {"$project": {
+        "email": 1,
+        "linkedin": 1,
+        "scheduled_for": 1,
+        "duration_minutes": 1,
+        "answers": 1,
+        "created_at": 1,
+        "has_enrichment": {"$gt": ["$enrichment", None]},
+        "link_slug": {"$arrayElemAt": ["$link.slug", 0]},
+    }},
+]
+
+_LINK_DETAILS_LOOKUP = _link_lookup({"slug": 1, "customQuestions": 1})
+
+# (monotonic time of the last refresh, UTC date as YYYY-MM-DD)
+_today_cache = (float("-inf"), "")
+
+def _utc_today() -> str:
+    """Today's UTC date as YYYY-MM-DD, recomputed at most once a second"""
+    global _today_cache
+    now = time.monotonic()
+    if now - _today_cache[0] >= 1:
+        _today_cache = (now, datetime.now(timezone.utc).date().isoformat())
+    return _today_cache[1]
+
+def _parse_scheduled_for(value: str) -> datetime:
+    """Parse a stored scheduled_for string, either a full ISO datetime or a date"""
+    if len(value) == 10:  # Date only format, YYYY-MM-DD
+        # Default to 9 AM if only date is provided
+        return datetime.fromisoformat(value + "T09:00:00+00:00")
+    return parse_iso_datetime(value)
+
+@dataclass(slots=True)
+class _MeetingListItem:
+    """One row of the meetings list; orjson serializes slotted dataclasses natively"""
+    id: str
+    client_email: str
+    client_linkedin: str
+    start_time: datetime
+    end_time: datetime
+    duration_minutes: int
+    answers: List[Dict[str, Any]]
+    link_slug: Optional[str]
+    created_at: Optional[datetime]
+    has_enrichment: bool
+
+def _process_meeting(event: Dict[str, Any]) -> Optional[_MeetingListItem]:
+    """Shape a scheduled event for the meetings list, or None if it can't be parsed"""
+    # Calculate times
+    start_time_str = event.get("scheduled_for")
+    duration_minutes = event.get("duration_minutes", 30)
+    
+    try:
+        start_time = _parse_scheduled_for(start_time_str)
+        end_time = start_time + timedelta(minutes=duration_minutes)
+    except Exception as e:
+        logger.error("Error processing event %s: %s", start_time_str, e)
+        return None
+    
+    return _MeetingListItem(
+        str(event.get("_id", "")),
+        event.get("email", ""),
+        event.get("linkedin", ""),
+        start_time,
+        end_time,
+        duration_minutes,
+        event.get("answers", []),
+        event.get("link_slug"),
+        event.get("created_at"),
+        event.get("has_enrichment", False)
+    )
+
+async def _stream_meetings(cursor, batch: List[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode the meetings list as a JSON array, one cursor batch at a time"""
+    separator = b"["
+    try:
+        while batch:
+            for event in batch:
+                meeting = _process_meeting(event)
+                if meeting is not None:
+                    yield separator + orjson.dumps(meeting)
+                    separator = b","
+            # Errors propagate: headers are already sent, so the server aborts
+            # the response and the client sees a broken transfer, not a short list
+            batch = await cursor.to_list(length=MEETINGS_BATCH_SIZE)
+        yield b"[]" if separator == b"[" else b"]"
+    finally:
+        # Also runs when the client disconnects mid-stream
+        await cursor.close()
+
 def init_meetings_routes():
     """
     Initialize meetings routes that require authentication.
@@ -18,121 +144,73 @@ def init_meetings_routes():
     """
     
     @router.get("")
-    async def get_user_meetings(request: Request):
+    async def get_user_meetings(user: dict = Depends(require_user)):
         """Get all scheduled meetings for the authenticated user"""
+        db = get_db()
         try:
-            user = request.session.get("user")
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
-
             user_email = user['email']
-            logger.info(f"Fetching scheduled meetings for user {user_email}")
+            logger.debug("Fetching scheduled meetings for user %s", user_email)
             
             # Fetch upcoming scheduled events
-            now = datetime.utcnow()
+            today = _utc_today()
             
-            scheduled_events = await db["scheduled_events"].find(
-                {
+            # One aggregation matches, sorts and joins each meeting's link
+            cursor = await db["scheduled_events"].aggregate([
+                {"$match": {
                     "user_id": user_email,
                     # Use string comparison for date range since scheduled_for is stored as string
                     "scheduled_for": {
-                        "$gte": now.isoformat().split('T')[0]
+                        "$gte": today
                     }
-                }
-            ).sort("scheduled_for", 1).to_list(length=None)
+                }},
+                *_MEETING_LIST_STAGES
+            ])
             
-            # Process scheduled events to include more details
-            processed_events = []
-            for event in scheduled_events:
-                # Fetch the scheduling link to get more context
-                link_id = event.get("scheduling_link_id")
-                link = None
-                if link_id:
-                    try:
-                        link = await db["schedule_links"].find_one({"_id": ObjectId(link_id)})
-                    except Exception as e:
-                        logger.error(f"Error fetching link for event: {str(e)}")
-                
-                # Calculate times
-                start_time_str = event.get("scheduled_for")
-                duration_minutes = event.get("duration_minutes", 30)
-                
-                try:
-                    # Parse the scheduled_for field
-                    if 'T' in start_time_str:  # ISO format with time
-                        start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                    else:  # Date only format
-                        # Default to 9 AM if only date is provided
-                        start_time = datetime.fromisoformat(f"{start_time_str}T09:00:00+00:00")
-                        
-                    end_time = start_time + timedelta(minutes=duration_minutes)
-                    
-                    # Check if event has enrichment data
-                    has_enrichment = bool(event.get("enrichment"))
-                    
-                    # Create a processed event object
-                    processed_event = {
-                        "id": str(event.get("_id", "")),
-                        "client_email": event.get("email", ""),
-                        "client_linkedin": event.get("linkedin", ""),
-                        "start_time": start_time.isoformat(),
-                        "end_time": end_time.isoformat(),
-                        "duration_minutes": duration_minutes,
-                        "answers": event.get("answers", []),
-                        "link_slug": link.get("slug") if link else None,
-                        "created_at": event.get("created_at").isoformat() if event.get("created_at") else None,
-                        "has_enrichment": has_enrichment
-                    }
-                    
-                    processed_events.append(processed_event)
-                except Exception as e:
-                    logger.error(f"Error processing event {start_time_str}: {str(e)}")
-                
-            return processed_events
+            # Read the first batch here so query errors still become a 500;
+            # the rest of the cursor is streamed batch by batch
+            first_batch = await cursor.to_list(length=MEETINGS_BATCH_SIZE)
+            # Streamed, so there is no body to derive an ETag from up front
+            return StreamingResponse(
+                _stream_meetings(cursor, first_batch),
+                media_type="application/json",
+                headers={"Cache-Control": PRIVATE_CACHE_CONTROL}
+            )
             
         except Exception as e:
-            logger.error(f"Error fetching scheduled meetings: {str(e)}")
+            logger.error("Error fetching scheduled meetings: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.get("/{meeting_id}")
-    async def get_meeting_details(request: Request, meeting_id: str):
+    async def get_meeting_details(meeting_id: str, request: Request, user: dict = Depends(require_user)):
         """Get details for a specific scheduled meeting"""
-        try:
-            user = request.session.get("user")
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
+        # Reject malformed ids before bson raises InvalidId (which became a 500)
+        if not is_object_id(meeting_id):
+            raise HTTPException(status_code=400, detail="Invalid meeting id")
 
+        db = get_db()
+        try:
             user_email = user['email']
             
-            # Fetch the meeting
-            meeting = await db["scheduled_events"].find_one({
-                "_id": ObjectId(meeting_id),
-                "user_id": user_email
-            })
+            # Fetch the meeting and join its scheduling link in one round trip
+            cursor = await db["scheduled_events"].aggregate([
+                {"$match": {"_id": ObjectId(meeting_id), "user_id": user_email}},
+                {"$limit": 1},
+                _LINK_DETAILS_LOOKUP
+            ])
+            meetings = await cursor.to_list(length=1)
             
-            if not meeting:
+            if not meetings:
                 raise HTTPException(status_code=404, detail="Meeting not found")
             
-            # Fetch associated scheduling link
-            link = None
-            if meeting.get("scheduling_link_id"):
-                try:
-                    link = await db["schedule_links"].find_one({"_id": ObjectId(meeting.get("scheduling_link_id"))})
-                except Exception as e:
-                    logger.error(f"Error fetching link for meeting: {str(e)}")
+            meeting = meetings[0]
+            link = meeting["link"][0] if meeting["link"] else None
             
             # Calculate times
             start_time_str = meeting.get("scheduled_for")
             duration_minutes = meeting.get("duration_minutes", 30)
             
             try:
-                # Parse the scheduled_for field
-                if 'T' in start_time_str:  # ISO format with time
-                    start_time = datetime.fromisoformat(start_time_str.replace('Z', '+00:00'))
-                else:  # Date only format
-                    # Default to 9 AM if only date is provided
-                    start_time = datetime.fromisoformat(f"{start_time_str}T09:00:00+00:00")
-                    
+                start_time = _parse_scheduled_for(start_time_str)
                 end_time = start_time + timedelta(minutes=duration_minutes)
                 
                 # Get enrichment data if it exists
@@ -143,8 +221,8 @@ def init_meetings_routes():
                     "id": str(meeting.get("_id", "")),
                     "client_email": meeting.get("email", ""),
                     "client_linkedin": meeting.get("linkedin", ""),
-                    "start_time": start_time.isoformat(),
-                    "end_time": end_time.isoformat(),
+                    "start_time": start_time,
+                    "end_time": end_time,
                     "duration_minutes": duration_minutes,
                     "answers": meeting.get("answers", []),
                     "link_details": {
@@ -152,25 +230,25 @@ def init_meetings_routes():
                         "slug": link.get("slug") if link else None,
                         "customQuestions": link.get("customQuestions", []) if link else []
                     } if link else None,
-                    "created_at": meeting.get("created_at").isoformat() if meeting.get("created_at") else None,
+                    "created_at": meeting.get("created_at"),
                     "enrichment": {
                         "linkedin_summary": enrichment.get("linkedin_summary"),
                         "augmented_note": enrichment.get("augmented_note"),
-                        "enriched_at": enrichment.get("enriched_at").isoformat() if enrichment.get("enriched_at") else None
+                        "enriched_at": enrichment.get("enriched_at")
                     } if enrichment else None
                 }
                 
-                return response
+                return cacheable_json(request, response)
                 
             except Exception as e:
-                logger.error(f"Error processing meeting {start_time_str}: {str(e)}")
+                logger.error("Error processing meeting %s: %s", start_time_str, e)
                 raise HTTPException(status_code=500, detail="Error processing meeting data")
             
         except HTTPException as he:
             # Re-raise HTTP exceptions
             raise he
         except Exception as e:
-            logger.error(f"Error fetching meeting details: {str(e)}")
+            logger.error("Error fetching meeting details: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     return router 
\ No newline at end of file
@@ -1,265 +1,318 @@
 from fastapi import APIRouter, HTTPException, Body, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.requests import Request as StarletteRequest
-from db.mongo import db
+from db.mongo import get_db
+from routes.dependencies import is_object_id
 from models.schedule_links import ScheduleLink
 from models.scheduled_events import ScheduledEvent
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, timezone
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+import asyncio
 import logging
 import json
-from typing import List, Dict, Any
+import orjson
+from urllib.parse import quote
+from typing import List, Dict, Any, AsyncIterator, Tuple
 from services.email_service import send_meeting_notification
 from services.linkedin_scraper_service import create_linkedin_summary
-# Set up logging with more detailed format
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from services.iso_dates import link_expiration_date, parse_iso_datetime
+from services.link_cache import USES_LEFT_FILTER, get_link_by_slug, invalidate_link
+
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
-# Helper function to convert MongoDB documents to JSON serializable format
-def make_serializable(obj):
-    if isinstance(obj, dict):
-        return {k: make_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_serializable(item) for item in obj]
-    elif isinstance(obj, ObjectId):
-        return str(obj)
-    elif isinstance(obj, (datetime, date)):
-        return obj.isoformat()
-    elif obj is None or isinstance(obj, (str, int, float, bool)):
-        return obj
-    else:
-        # Try to convert other types to string
-        try:
-            return str(obj)
-        except Exception:
-            return None
+def _bson_default(obj):
+    """orjson fallback for the BSON types it doesn't encode natively (ObjectId, Decimal128)"""
+    return str(obj)
+
+def _bson_dumps(content: Any) -> bytes:
+    """Encode Mongo documents straight to JSON; datetimes, dicts and lists stay in orjson's C code"""
+    return orjson.dumps(content, default=_bson_default, option=orjson.OPT_NON_STR_KEYS)
+
+async def _stream_schedule(head: bytes, cursor, batch: List[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Finish the public schedule JSON after its head, streaming the events cursor batch by batch"""
+    try:
+        yield head
+        separator = b""
+        while batch:
+            yield separator + b",".join([_bson_dumps(event) for event in batch])
+            separator = b","
+            # Errors propagate: headers are already sent, so the server aborts
+            # the response and the client sees a broken transfer, not a short list
+            batch = await cursor.to_list(length=PUBLIC_EVENTS_BATCH_SIZE)
+        yield b"]}"
+    finally:
+        # Also runs when the client disconnects mid-stream
+        if cursor is not None:
+            await cursor.close()
 
 router = APIRouter(prefix="/public", tags=["public"])
 
+# Calendar events read from the cursor per streamed chunk
+PUBLIC_EVENTS_BATCH_SIZE = 64
+
+# Busy slots only; descriptions, locations and attendees stay private
+_PUBLIC_EVENT_PROJECTION = {"calendar_id": 1, "start_time": 1, "end_time": 1, "summary": 1, "_id": 0}
+
+# Link fields the booking checks read
+_BOOKING_LINK_PROJECTION = {
+    "slug": 1,
+    "userId": 1,
+    "expirationDate": 1,
+    "uses": 1,
+    "maxUses": 1,
+    "maxDaysInAdvance": 1,
+    "meetingLength": 1,
+}
+
+# Schedule loads in progress, by slug. Concurrent requests for the same slug
+# (a link shared on social media) await one load instead of each repeating it.
+_inflight: Dict[str, "asyncio.Future[Tuple[bytes, List[str], int]]"] = {}
+
+async def _fetch_schedule(slug: str) -> Tuple[bytes, List[str], int]:
+    """Load everything the public page needs except the events.
+
+    Returns the encoded response head, the advisor's calendar ids and the
+    link's booking window in days.
+    """
+    db = get_db()
+    # Find the link by slug
+    logger.debug("[PUBLIC] Searching for schedule link with slug: %s", slug)
+    link = await get_link_by_slug(slug)
+    
+    if not link:
+        logger.warning("[PUBLIC] Schedule link not found for slug: %s", slug)
+        raise HTTPException(status_code=404, detail="Schedule link not found")
+    
+    logger.debug("[PUBLIC] Found link: %s - Fields: maxDaysInAdvance=%s, meetingLength=%s", link.get('slug'), link.get('maxDaysInAdvance'), link.get('meetingLength'))
+    
+    # Check if link has expired
+    expiration_date = link_expiration_date(link)
+    if expiration_date and expiration_date < datetime.now(timezone.utc).date():
+        logger.warning("[PUBLIC] Link %s has expired on %s", slug, expiration_date)
+        raise HTTPException(status_code=400, detail="This link has expired")
+    
+    # Check if link has reached maximum uses
+    if link.get("maxUses") and link.get("uses", 0) >= link["maxUses"]:
+        logger.warning("[PUBLIC] Link %s has reached max uses: %s/%s", slug, link.get('uses'), link.get('maxUses'))
+        raise HTTPException(status_code=400, detail="This link has reached its maximum number of uses")
+    
+    # Advisor, availability windows and calendars are independent reads,
+    # so issue them concurrently on the pool
+    user_email = link.get("userId")
+    logger.debug("[PUBLIC] Fetching advisor data, availability and calendars for: %s", user_email)
+    
+    advisor, availability_docs, calendars = await asyncio.gather(
+        db["users"].find_one({"email": user_email}, {"name": 1, "email": 1, "_id": 0}),
+        db["availability_windows"].find({"user_id": user_email}, {"user_id": 0}).to_list(length=None),
+        db["calendars"].find({"user_email": user_email}, {"id": 1, "_id": 0}).to_list(length=None)
+    )
+    
+    advisor_data = None
+    if advisor:
+        advisor_data = {
+            "name": advisor.get("name", "Advisor"),
+            "email": advisor.get("email")
+        }
+        logger.debug("[PUBLIC] Found advisor: %s", advisor_data['name'])
+    else:
+        advisor_data = {
+            "name": "Advisor",
+            "email": user_email
+        }
+        logger.warning("[PUBLIC] No advisor found for email: %s, using default", user_email)
+    
+    logger.debug("[PUBLIC] Found %d availability windows", len(availability_docs))
+    
+    calendar_ids = [cal.get("id") for cal in calendars if cal.get("id")]
+    logger.debug("[PUBLIC] Found %d connected calendars", len(calendar_ids))
+    
+    # Encode everything but the events up front, leaving the object open
+    head = _bson_dumps({
+        "link": link,
+        "advisor": advisor_data,
+        "availability": availability_docs
+    })[:-1] + b',"events":['
+    
+    # Get maxDaysInAdvance from the link or default to 14
+    return head, calendar_ids, link.get("maxDaysInAdvance", 14)
+
+def _finish_load(slug: str, future: asyncio.Future) -> None:
+    """Drop a finished load so the next request starts a fresh one"""
+    _inflight.pop(slug, None)
+    if not future.cancelled():
+        # Marks the exception as retrieved even if every waiter went away
+        future.exception()
+
+async def _load_schedule(slug: str) -> Tuple[bytes, List[str], int]:
+    """_fetch_schedule, shared by every concurrent request for the same slug"""
+    future = _inflight.get(slug)
+    if future is None:
+        # A task rather than a bare Future, so one client disconnecting
+        # doesn't cancel the load for the others waiting on it
+        future = asyncio.ensure_future(_fetch_schedule(slug))
+        _inflight[slug] = future
+        future.add_done_callback(lambda f: _finish_load(slug, f))
+    return await asyncio.shield(future)
+
 def init_public_routes():
     """
     Initialize public routes that don't require authentication.
     Returns the router with all public endpoints configured.
     """
-    logger.info("Initializing public routes")
+    logger.debug("Initializing public routes")
     
     @router.get("/schedule/{slug}")
     async def get_public_schedule_link(slug: str):
         """Get public scheduling link data by slug without authentication"""
-        logger.info(f"[PUBLIC] GET /schedule/{slug} - Fetching public schedule link")
+        db = get_db()
+        logger.debug("[PUBLIC] GET /schedule/%s - Fetching public schedule link", slug)
         try:
-            # Find the link by slug
-            logger.info(f"[PUBLIC] Searching for schedule link with slug: {slug}")
-            link = await db["schedule_links"].find_one({"slug": slug})
-            
-            if not link:
-                logger.warning(f"[PUBLIC] Schedule link not found for slug: {slug}")
-                raise HTTPException(status_code=404, detail="Schedule link not found")
-            
-            logger.info(f"[PUBLIC] Found link: {link.get('slug')} - Fields: maxDaysInAdvance={link.get('maxDaysInAdvance')}, meetingLength={link.get('meetingLength')}")
-            
-            # Check if link has expired
-            if link.get("expirationDate"):
-                expiration_date_str = str(link["expirationDate"])
-                if 'Z' in expiration_date_str:
-                    expiration_date = datetime.fromisoformat(expiration_date_str.replace('Z', '+00:00'))
-                elif '+' in expiration_date_str or '-' in expiration_date_str and 'T' in expiration_date_str:
-                    expiration_date = datetime.fromisoformat(expiration_date_str)
-                else:
-                    expiration_date = datetime.fromisoformat(expiration_date_str)
-                
-                # Convert to naive datetime for comparison
-                if expiration_date.tzinfo is not None:
-                    expiration_date = expiration_date.replace(tzinfo=None)
-                
-                if expiration_date.date() < datetime.utcnow().date():
-                    logger.warning(f"[PUBLIC] Link {slug} has expired on {expiration_date.date()}")
-                    raise HTTPException(status_code=400, detail="This link has expired")
-            
-            # Check if link has reached maximum uses
-            if link.get("maxUses") and link.get("uses", 0) >= link["maxUses"]:
-                logger.warning(f"[PUBLIC] Link {slug} has reached max uses: {link.get('uses')}/{link.get('maxUses')}")
-                raise HTTPException(status_code=400, detail="This link has reached its maximum number of uses")
-            
-            # Get advisor data
-            user_email = link.get("userId")
-            logger.info(f"[PUBLIC] Fetching advisor data for email: {user_email}")
-            
-            advisor = await db["users"].find_one({"email": user_email})
-            advisor_data = None
-            if advisor:
-                advisor_data = {
-                    "name": advisor.get("name", "Advisor"),
-                    "email": advisor.get("email")
-                }
-                logger.info(f"[PUBLIC] Found advisor: {advisor_data['name']}")
-            else:
-                advisor_data = {
-                    "name": "Advisor",
-                    "email": user_email
-                }
-                logger.warning(f"[PUBLIC] No advisor found for email: {user_email}, using default")
-            
-            # Get availability windows
-            logger.info(f"[PUBLIC] Fetching availability windows for user: {user_email}")
-            availability_docs = await db["availability_windows"].find(
-                {"user_id": user_email}
-            ).to_list(length=None)
+            head, calendar_ids, max_days_in_advance = await _load_schedule(slug)
             
-            logger.info(f"[PUBLIC] Found {len(availability_docs)} availability windows")
-            
-            # Get events
-            logger.info(f"[PUBLIC] Fetching calendar events for user: {user_email}")
-            calendars = await db["calendars"].find(
-                {"user_email": user_email}
-            ).to_list(length=None)
-            
-            calendar_ids = [cal.get("id") for cal in calendars if cal.get("id")]
-            logger.info(f"[PUBLIC] Found {len(calendar_ids)} connected calendars")
-            
-            # Get maxDaysInAdvance from the link or default to 14
-            max_days_in_advance = link.get("maxDaysInAdvance", 14)
             now = datetime.utcnow()
             max_date = now + timedelta(days=max_days_in_advance)
             
-            events = []
-            for calendar_id in calendar_ids:
+            # One set-oriented query covers every connected calendar; the first
+            # batch is read here, the rest while the response streams. Each
+            # request reads its own cursor, only the part above is shared.
+            cursor = None
+            first_batch = []
+            if calendar_ids:
                 try:
-                    logger.info(f"[PUBLIC] Fetching events for calendar: {calendar_id}")
-                    calendar_events = await db["events"].find(
+                    cursor = db["events"].find(
                         {
-                            "calendar_id": calendar_id,
+                            "calendar_id": {"$in": calendar_ids},
                             "start_time": {"$lte": max_date},
                             "end_time": {"$gte": now}
-                        }
-                    ).to_list(length=None)
-                    
-                    logger.info(f"[PUBLIC] Found {len(calendar_events)} events for calendar {calendar_id}")
-                    events.extend(calendar_events)
-                    
+                        },
+                        _PUBLIC_EVENT_PROJECTION
+                    )
+                    first_batch = await cursor.to_list(length=PUBLIC_EVENTS_BATCH_SIZE)
                 except Exception as e:
-                    logger.error(f"[PUBLIC] Error fetching events for calendar {calendar_id}: {str(e)}")
-            
-            # Prepare response
-            response_data = {
-                "link": link,
-                "advisor": advisor_data,
-                "availability": availability_docs,
-                "events": events
-            }
+                    logger.error("[PUBLIC] Error fetching events for calendars %s: %s", calendar_ids, e)
+                    cursor = None
             
-            logger.info(f"[PUBLIC] Successfully prepared response for slug: {slug}")
-            return make_serializable(response_data)
+            logger.info("[PUBLIC] Successfully prepared response for slug: %s", slug)
+            return StreamingResponse(_stream_schedule(head, cursor, first_batch), media_type="application/json")
             
         except HTTPException as he:
-            logger.error(f"[PUBLIC] HTTP Exception for slug {slug}: {str(he)}")
+            logger.error("[PUBLIC] HTTP Exception for slug %s: %s", slug, he)
             raise
         except Exception as e:
-            logger.error(f"[PUBLIC] Error fetching public schedule link for {slug}: {str(e)}")
+            logger.error("[PUBLIC] Error fetching public schedule link for %s: %s", slug, e)
             raise HTTPException(status_code=500, detail=str(e))
 
     @router.post("/schedule/book")
     async def book_meeting(booking: ScheduledEvent, background_tasks: BackgroundTasks):
         """Book a meeting through a public scheduling link without authentication"""
+        # Reject malformed ids before bson raises InvalidId (which became a 500)
+        if not is_object_id(booking.scheduling_link_id):
+            raise HTTPException(status_code=400, detail="Invalid link id")
+
+        db = get_db()
         try:
-            logger.info(f"[Booking] Starting booking process for email: {booking.email}")
-            
-            # Find the scheduling link
-            logger.info(f"[Booking] Looking up schedule link ID: {booking.scheduling_link_id}")
-            link = await db["schedule_links"].find_one({"_id": ObjectId(booking.scheduling_link_id)})
+            logger.debug("[Booking] Starting booking process for email: %s", booking.email)
+            
+            link_oid = ObjectId(booking.scheduling_link_id)
+            
+            # Claim a use of the link atomically: the filter only matches while
+            # uses are left (a falsy maxUses means unlimited), so concurrent
+            # bookings can't both take the last one
+            logger.debug("[Booking] Claiming a use of schedule link ID: %s", booking.scheduling_link_id)
+            link = await db["schedule_links"].find_one_and_update(
+                {"_id": link_oid, **USES_LEFT_FILTER},
+                {"$inc": {"uses": 1}},
+                projection=_BOOKING_LINK_PROJECTION
+            )
             if not link:
-                logger.error(f"[Booking] Schedule link not found: {booking.scheduling_link_id}")
+                if await db["schedule_links"].find_one({"_id": link_oid}, {"_id": 1}):
+                    logger.warning("[Booking] Link reached max uses: %s", booking.scheduling_link_id)
+                    raise HTTPException(status_code=400, detail="This link has reached its maximum number of uses")
+                logger.error("[Booking] Schedule link not found: %s", booking.scheduling_link_id)
                 raise HTTPException(status_code=404, detail="Schedule link not found")
             
             # get advisor email
             user_email = link.get("userId")
-            logger.info(f"[Booking] Advisor email: {user_email}")
+            logger.debug("[Booking] Advisor email: %s", user_email)
             
-            # Validate link expire time
-            if link.get("expirationDate"):
-                logger.info(f"[Booking] Validating expiration date: {link.get('expirationDate')}")
-                expiration_date = datetime.fromisoformat(str(link["expirationDate"]))
+            try:
+                # Validate link expire time
+                expiration_date = link_expiration_date(link)
+                if expiration_date and expiration_date < datetime.now(timezone.utc).date():
+                    logger.warning("[Booking] Link expired on %s", expiration_date)
+                    raise HTTPException(status_code=400, detail="This link has expired")
+                
+                # Parse dates and validate booking time
+                logger.debug("[Booking] Validating scheduled date: %s", booking.scheduled_for)
+                start_time = parse_iso_datetime(booking.scheduled_for)
+                scheduled_date = start_time
                 # Convert to naive datetime for comparison if it's timezone-aware
-                if expiration_date.tzinfo is not None:
-                    expiration_date = expiration_date.replace(tzinfo=None)
+                if scheduled_date.tzinfo is not None:
+                    scheduled_date = scheduled_date.replace(tzinfo=None)
                 
-                now = datetime.utcnow()  # Use naive UTC time
-                if expiration_date.date() < now.date():
-                    logger.warning(f"[Booking] Link expired on {expiration_date.date()}")
-                    raise HTTPException(status_code=400, detail="This link has expired")
-            
-            # validate max uses
-            current_uses = link.get("uses", 0)
-            max_uses = link.get("maxUses")
-            if max_uses:
-                logger.info(f"[Booking] Checking usage limit: {current_uses}/{max_uses}")
-                if current_uses >= max_uses:
-                    logger.warning(f"[Booking] Link reached max uses: {current_uses}/{max_uses}")
-                    raise HTTPException(status_code=400, detail="This link has reached its maximum number of uses")
-            
-            # Parse dates and validate booking time
-            logger.info(f"[Booking] Validating scheduled date: {booking.scheduled_for}")
-            scheduled_date = datetime.fromisoformat(booking.scheduled_for)
-            # Convert to naive datetime for comparison if it's timezone-aware
-            if scheduled_date.tzinfo is not None:
-                scheduled_date = scheduled_date.replace(tzinfo=None)
-            
-            max_days = link.get("maxDaysInAdvance", 14)
-            max_future_date = datetime.utcnow() + timedelta(days=max_days)
-            
-            if scheduled_date > max_future_date:
-                logger.warning(f"[Booking] Date too far in future: {scheduled_date} > {max_future_date}")
-                raise HTTPException(status_code=400, detail=f"Cannot book more than {max_days} days in advance")
-            
-            # Check for double booking
-            logger.info(f"[Booking] Checking for double booking at {booking.scheduled_for}")
-            existing_booking = await db["scheduled_events"].find_one({
-                "user_id": user_email,
-                "scheduled_for": booking.scheduled_for
-            })
-            if existing_booking:
-                logger.warning(f"[Booking] Time slot already booked: {booking.scheduled_for}")
-                raise HTTPException(status_code=400, detail="This time slot is no longer available")
-            
-            # Use correct duration from link
-            booking.duration_minutes = link.get("meetingLength", booking.duration_minutes)
-            logger.info(f"[Booking] Using duration: {booking.duration_minutes} minutes")
-            
-            # Create and save the scheduled event
-            event = {
-                "scheduling_link_id": booking.scheduling_link_id,
-                "user_id": user_email,
-                "scheduled_for": booking.scheduled_for,
-                "duration_minutes": booking.duration_minutes,
-                "email": booking.email,
-                "linkedin": booking.linkedin,
-                "answers": [answer.dict() for answer in booking.answers],
-                "created_at": datetime.utcnow()
-            }
-            
-            logger.info("[Booking] Inserting scheduled event")
-            result = await db["scheduled_events"].insert_one(event)
-            
-            # Update link usage counter
-            logger.info("[Booking] Updating link usage counter")
-            await db["schedule_links"].update_one(
-                {"_id": ObjectId(booking.scheduling_link_id)},
-                {"$inc": {"uses": 1}}
-            )
+                max_days = link.get("maxDaysInAdvance", 14)
+                max_future_date = datetime.utcnow() + timedelta(days=max_days)
+                
+                if scheduled_date > max_future_date:
+                    logger.warning("[Booking] Date too far in future: %s > %s", scheduled_date, max_future_date)
+                    raise HTTPException(status_code=400, detail=f"Cannot book more than {max_days} days in advance")
+                
+                # Use correct duration from link
+                booking.duration_minutes = link.get("meetingLength", booking.duration_minutes)
+                logger.debug("[Booking] Using duration: %s minutes", booking.duration_minutes)
+                
+                # Create and save the scheduled event
+                event = {
+                    "scheduling_link_id": booking.scheduling_link_id,
+                    "user_id": user_email,
+                    "scheduled_for": booking.scheduled_for,
+                    # Typed copy for date-range queries; reads move to it once
+                    # existing documents are backfilled
+                    "scheduled_for_dt": start_time,
+                    "duration_minutes": booking.duration_minutes,
+                    "email": booking.email,
+                    "linkedin": booking.linkedin,
+                    "answers": [answer.model_dump() for answer in booking.answers],
+                    "created_at": datetime.utcnow()
+                }
+                
+                # Check for double booking. The unique (user_id, scheduled_for)
+                # index also rejects the ones racing past this check, but only
+                # once ensure_booking_index() could build it
+                logger.debug("[Booking] Checking for double booking at %s", booking.scheduled_for)
+                existing_booking = await db["scheduled_events"].find_one({
+                    "user_id": user_email,
+                    "scheduled_for": booking.scheduled_for
+                }, {"_id": 1})
+                if existing_booking:
+                    logger.warning("[Booking] Time slot already booked: %s", booking.scheduled_for)
+                    raise HTTPException(status_code=400, detail="This time slot is no longer available")
+                
+                logger.debug("[Booking] Inserting scheduled event")
+                try:
+                    result = await db["scheduled_events"].insert_one(event)
+                except DuplicateKeyError:
+                    logger.warning("[Booking] Time slot already booked: %s", booking.scheduled_for)
+                    raise HTTPException(status_code=400, detail="This time slot is no longer available")
+            except Exception:
+                # Give back the use claimed above
+                await db["schedule_links"].update_one({"_id": link_oid}, {"$inc": {"uses": -1}})
+                raise
+            
+            invalidate_link(link.get("slug"))
 
             # Get insert id 
             event_id = result.inserted_id
-            logger.info(f"[Booking] Event created with ID: {event_id}")
+            logger.debug("[Booking] Event created with ID: %s", event_id)
             
             # Use non-deprecated way to get UTC time
             event_created_at = datetime.utcnow()
             
             # Ensure internal calendar exists for the advisor
-            logger.info(f"[Booking] Ensuring internal calendar exists for advisor: {user_email}")
+            logger.debug("[Booking] Ensuring internal calendar exists for advisor: %s", user_email)
             internal_calendar = {
                 "id": "internal",
                 "user_email": user_email,
@@ -278,7 +331,7 @@ def init_public_routes():
                 {"$set": internal_calendar},
                 upsert=True
             )
-            logger.info(f"[Booking] Internal calendar ensured for advisor: {user_email}")
+            logger.debug("[Booking] Internal calendar ensured for advisor: %s", user_email)
             
             # insert to events for advisor
             calendar_event = {
@@ -286,25 +339,25 @@ def init_public_routes():
                 "id": str(event_id),  # Convert ObjectId to string
                 "created_at": event_created_at,
                 "description": None,
-                "end_time": datetime.fromisoformat(booking.scheduled_for) + timedelta(minutes=booking.duration_minutes),
+                "end_time": start_time + timedelta(minutes=booking.duration_minutes),
                 "location": None,
-                "start_time": datetime.fromisoformat(booking.scheduled_for),
+                "start_time": start_time,
                 "status": "confirmed",
                 "summary": "Meeting with client " + booking.email,
                 "updated_at": event_created_at
             }
 
-            logger.info("[Booking] Creating calendar event")
+            logger.debug("[Booking] Creating calendar event")
             calendar_event_result = await db["events"].insert_one(calendar_event)
             
             if not calendar_event_result.inserted_id:
                 logger.error("[Booking] Failed to insert calendar event")
                 raise HTTPException(status_code=500, detail="Failed to insert calendar event")
             
-            logger.info(f"[Booking] calendar event created with id: {calendar_event_result.inserted_id}")
+            logger.debug("[Booking] calendar event created with id: %s", calendar_event_result.inserted_id)
         
             # Add email notification to background tasks instead of awaiting it
-            logger.info("[Booking] Scheduling email notification")
+            logger.debug("[Booking] Scheduling email notification")
             background_tasks.add_task(
                 send_meeting_notification,
                 advisor_email=user_email,
@@ -318,7 +371,7 @@ def init_public_routes():
             
             # run background task to get reponse summary and insights text
             if booking.linkedin:
-                logger.info(f"[Booking] Scheduling LinkedIn analysis for profile: {booking.linkedin}")
+                logger.debug("[Booking] Scheduling LinkedIn analysis for profile: %s", booking.linkedin)
                 background_tasks.add_task(
                     create_linkedin_summary,
                     event_id=str(result.inserted_id),
@@ -327,7 +380,7 @@ def init_public_routes():
                     answers=booking.answers
                 )
             
-            logger.info("[Booking] Successfully completed booking process")
+            logger.info("[Booking] Booked %s for advisor %s (event %s)", booking.scheduled_for, user_email, event_id)
             return {
                 "success": True,
                 "message": "Meeting scheduled successfully",
@@ -335,18 +388,19 @@ def init_public_routes():
             }
             
         except HTTPException as he:
-            logger.error(f"[Booking] HTTP Exception: {str(he.detail)}")
+            logger.error("[Booking] HTTP Exception: %s", he.detail)
             raise
         except Exception as e:
-            logger.error(f"[Booking] Unexpected error: {str(e)}")
+            logger.error("[Booking] Unexpected error: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     # Add a catch-all route to handle direct URL access
     @router.get("/{slug}")
     async def redirect_public_schedule_link(slug: str):
         """Redirect to the proper public schedule link format"""
-        logger.info(f"[PUBLIC] GET /{slug} - Redirecting to proper schedule link format")
-        return await get_public_schedule_link(slug)
+        logger.debug("[PUBLIC] GET /%s - Redirecting to proper schedule link format", slug)
+        # Permanent, so browsers cache it and go straight to the real endpoint
+        return RedirectResponse(url=f"{router.prefix}/schedule/{quote(slug, safe='')}", status_code=308)
     
-    logger.info("Public routes initialization complete")
+    logger.debug("Public routes initialization complete")
     return router 
\ No newline at end of file
@@ -0,0 +1,34 @@
+from typing import Any
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+import hashlib
+import orjson
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson instead of the stdlib json module.
+
+    FastAPI ships its own ORJSONResponse but deprecates it in favour of
+    response models; our handlers return plain dicts, so we keep a local one.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+# Dashboard components poll these endpoints; letting the browser reuse a
+# response for a few seconds coalesces the polls of one page load
+PRIVATE_CACHE_CONTROL = "private, max-age=5"
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+def cacheable_json(request: Request, content: Any) -> Response:
+    """Render content with an ETag of its body, answering 304 if the client already has it"""
+    response = ORJSONResponse(content, headers={"Cache-Control": PRIVATE_CACHE_CONTROL})
+    etag = '"' + hashlib.blake2b(response.body, digest_size=16).hexdigest() + '"'
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    return response
@@ -1,19 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
+from routes.dependencies import is_object_id, require_user
 from models.schedule_links import ScheduleLink, DateEncoder
-from db.mongo import db
+from db.mongo import get_db
 from typing import List
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 import logging
 from bson import ObjectId
 from pymongo.errors import DuplicateKeyError
+from services.iso_dates import link_expiration_date
+from services.link_cache import USES_LEFT_FILTER, invalidate_link
 import json
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/schedule-links", tags=["schedule-links"])
 
+async def _claim_link_use(slug: str) -> dict:
+    """Take one use of a link atomically and return the link as it was before.
+
+    Reads the database rather than the link cache: counts cached per worker
+    would let concurrent visits push a link past maxUses.
+    """
+    db = get_db()
+    link = await db["schedule_links"].find_one_and_update(
+        {"slug": slug, **USES_LEFT_FILTER},
+        {"$inc": {"uses": 1}}
+    )
+    if not link:
+        if await db["schedule_links"].find_one({"slug": slug}, {"_id": 1}):
+            raise HTTPException(status_code=400, detail="This link has reached its maximum number of uses")
+        raise HTTPException(status_code=404, detail="Schedule link not found")
+    invalidate_link(slug)
+    
+    # Check if link has expired
+    expiration_date = link_expiration_date(link)
+    if expiration_date and expiration_date < datetime.now(timezone.utc).date():
+        # Give back the use claimed above
+        await db["schedule_links"].update_one({"_id": link["_id"]}, {"$inc": {"uses": -1}})
+        raise HTTPException(status_code=400, detail="This link has expired")
+    
+    return link
+
 def init_schedule_links_routes():
     """
     Initialize schedule links routes.
@@ -21,15 +49,12 @@ def init_schedule_links_routes():
     """
     
     @router.get("")
-    async def get_schedule_links(request: Request):
+    async def get_schedule_links(user: dict = Depends(require_user)):
         """Get all schedule links for the current user"""
+        db = get_db()
         try:
-            user = request.session.get("user")
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
-
             user_email = user['email']
-            logger.info(f"Fetching schedule links for user {user_email}")
+            logger.info("Fetching schedule links for user %s", user_email)
             
             links = await db["schedule_links"].find(
                 {"userId": user_email}
@@ -46,19 +71,16 @@ def init_schedule_links_routes():
             }
             
         except Exception as e:
-            logger.error(f"Error fetching schedule links: {str(e)}")
+            logger.error("Error fetching schedule links: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     @router.post("")
-    async def create_schedule_link(request: Request, link: ScheduleLink):
+    async def create_schedule_link(link: ScheduleLink, user: dict = Depends(require_user)):
         """Create a new schedule link"""
+        db = get_db()
         try:
-            user = request.session.get("user")
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
-
             user_email = user['email']
-            logger.info(f"Creating schedule link for user {user_email}")
+            logger.info("Creating schedule link for user %s", user_email)
             
             # Check if slug already exists for this user
             existing_link = await db["schedule_links"].find_one({
@@ -74,7 +96,7 @@ def init_schedule_links_routes():
             
             # Convert to database format
             now = datetime.utcnow()
-            link_data = link.dict()
+            link_data = link.model_dump()
             
             # Convert date objects to ISO format strings for MongoDB
             if link_data.get('expirationDate'):
@@ -90,6 +112,8 @@ def init_schedule_links_routes():
             
             result = await db["schedule_links"].insert_one(link_data)
             link_data["_id"] = str(result.inserted_id)
+            # The slug may have been looked up (and remembered as missing) before
+            invalidate_link(link.slug)
             
             return link_data
             
@@ -102,19 +126,20 @@ def init_schedule_links_routes():
                 detail=f"A link with slug '{link.slug}' already exists"
             )
         except Exception as e:
-            logger.error(f"Error creating schedule link: {str(e)}")
+            logger.error("Error creating schedule link: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     @router.put("/{link_id}")
-    async def update_schedule_link(request: Request, link_id: str, link: ScheduleLink):
+    async def update_schedule_link(link_id: str, link: ScheduleLink, user: dict = Depends(require_user)):
         """Update an existing schedule link"""
-        try:
-            user = request.session.get("user")
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
+        # Reject malformed ids before bson raises InvalidId (which became a 500)
+        if not is_object_id(link_id):
+            raise HTTPException(status_code=400, detail="Invalid link id")
 
+        db = get_db()
+        try:
             user_email = user['email']
-            logger.info(f"Updating schedule link for user {user_email}")
+            logger.info("Updating schedule link for user %s", user_email)
             
             # Check if the link exists and belongs to the user
             existing_link = await db["schedule_links"].find_one({
@@ -141,7 +166,7 @@ def init_schedule_links_routes():
             
             # Update link data
             now = datetime.utcnow()
-            link_data = link.dict()
+            link_data = link.model_dump()
             
             # Convert date objects to ISO format strings for MongoDB
             if link_data.get('expirationDate'):
@@ -158,6 +183,8 @@ def init_schedule_links_routes():
                 {"_id": ObjectId(link_id)},
                 {"$set": link_data}
             )
+            invalidate_link(existing_link["slug"])
+            invalidate_link(link.slug)
             
             # Return updated link
             link_data["_id"] = link_id
@@ -169,26 +196,28 @@ def init_schedule_links_routes():
             # Re-raise HTTP exceptions directly
             raise
         except Exception as e:
-            logger.error(f"Error updating schedule link: {str(e)}")
+            logger.error("Error updating schedule link: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     @router.delete("/{link_id}")
-    async def delete_schedule_link(request: Request, link_id: str):
+    async def delete_schedule_link(link_id: str, user: dict = Depends(require_user)):
         """Delete a schedule link"""
-        try:
-            user = request.session.get("user")
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
+        # Reject malformed ids before bson raises InvalidId (which became a 500)
+        if not is_object_id(link_id):
+            raise HTTPException(status_code=400, detail="Invalid link id")
 
+        db = get_db()
+        try:
             user_email = user['email']
             
-            result = await db["schedule_links"].delete_one({
-                "_id": ObjectId(link_id),
-                "userId": user_email
-            })
+            deleted = await db["schedule_links"].find_one_and_delete(
+                {"_id": ObjectId(link_id), "userId": user_email},
+                projection={"slug": 1}
+            )
             
-            if result.deleted_count == 0:
+            if not deleted:
                 raise HTTPException(status_code=404, detail="Schedule link not found")
+            invalidate_link(deleted.get("slug"))
             
             return {"status": "ok", "message": "Schedule link deleted successfully"}
             
@@ -196,17 +225,18 @@ def init_schedule_links_routes():
             # Re-raise HTTP exceptions directly
             raise
         except Exception as e:
-            logger.error(f"Error deleting schedule link: {str(e)}")
+            logger.error("Error deleting schedule link: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     @router.get("/{link_id}")
-    async def get_schedule_link(request: Request, link_id: str):
+    async def get_schedule_link(link_id: str, user: dict = Depends(require_user)):
         """Get a specific schedule link by ID"""
-        try:
-            user = request.session.get("user")
-            if not user:
-                raise HTTPException(status_code=401, detail="Not authenticated")
+        # Reject malformed ids before bson raises InvalidId (which became a 500)
+        if not is_object_id(link_id):
+            raise HTTPException(status_code=400, detail="Invalid link id")
 
+        db = get_db()
+        try:
             user_email = user['email']
             
             link = await db["schedule_links"].find_one({
@@ -226,34 +256,15 @@ def init_schedule_links_routes():
             # Re-raise HTTP exceptions directly
             raise
         except Exception as e:
-            logger.error(f"Error fetching schedule link: {str(e)}")
+            logger.error("Error fetching schedule link: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     @router.get("/public/{slug}")
     async def get_public_schedule_link(request: Request, slug: str):
         """Get a public schedule link by slug and increment visit counter"""
         try:
-            # Find the link by slug
-            link = await db["schedule_links"].find_one({"slug": slug})
-            
-            if not link:
-                raise HTTPException(status_code=404, detail="Schedule link not found")
-            
-            # Check if link has expired
-            if link.get("expirationDate"):
-                expiration_date = datetime.fromisoformat(link["expirationDate"]) if isinstance(link["expirationDate"], str) else link["expirationDate"]
-                if expiration_date.date() < datetime.now().date():
-                    raise HTTPException(status_code=400, detail="This link has expired")
-            
-            # Check if link has reached maximum uses
-            if link.get("maxUses") and link.get("uses", 0) >= link["maxUses"]:
-                raise HTTPException(status_code=400, detail="This link has reached its maximum number of uses")
-            
-            # Increment the visit counter
-            await db["schedule_links"].update_one(
-                {"_id": link["_id"]},
-                {"$inc": {"uses": 1}}
-            )
+            # Count the visit as a use
+            link = await _claim_link_use(slug)
             
             # Prepare the response - only include necessary fields for public usage
             public_link = {
@@ -269,37 +280,15 @@ def init_schedule_links_routes():
             # Re-raise HTTP exceptions directly
             raise
         except Exception as e:
-            logger.error(f"Error fetching public schedule link: {str(e)}")
+            logger.error("Error fetching public schedule link: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     @router.post("/increment-use/{slug}")
     async def increment_link_usage(request: Request, slug: str):
         """Increment the use counter for a schedule link"""
         try:
-            # Find the link by slug
-            link = await db["schedule_links"].find_one({"slug": slug})
-            
-            if not link:
-                raise HTTPException(status_code=404, detail="Schedule link not found")
-            
-            # Check if link has expired
-            if link.get("expirationDate"):
-                expiration_date = datetime.fromisoformat(link["expirationDate"]) if isinstance(link["expirationDate"], str) else link["expirationDate"]
-                if expiration_date.date() < datetime.now().date():
-                    raise HTTPException(status_code=400, detail="This link has expired")
-            
-            # Check if link has reached maximum uses
-            if link.get("maxUses") and link.get("uses", 0) >= link["maxUses"]:
-                raise HTTPException(status_code=400, detail="This link has reached its maximum number of uses")
-            
             # Increment the use counter
-            result = await db["schedule_links"].update_one(
-                {"_id": link["_id"]},
-                {"$inc": {"uses": 1}}
-            )
-            
-            if result.modified_count == 0:
-                raise HTTPException(status_code=500, detail="Failed to increment link usage")
+            await _claim_link_use(slug)
             
             return {"status": "ok", "message": "Link usage incremented"}
             
@@ -307,7 +296,7 @@ def init_schedule_links_routes():
             # Re-raise HTTP exceptions directly
             raise
         except Exception as e:
-            logger.error(f"Error incrementing link usage: {str(e)}")
+            logger.error("Error incrementing link usage: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     return router 
\ No newline at end of file
@@ -1,28 +1,37 @@
 from typing import List, Optional
 from datetime import datetime
 from models.calendar import Calendar
-from db.mongo import db
+from db.mongo import get_db
 from fastapi import HTTPException
+from cachetools import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# (user_email, calendar_id) pairs known to exist. Only positive results are
+# cached, so a newly connected calendar is visible immediately; deleting a
+# calendar through this service invalidates its entry.
+OWNERSHIP_CACHE_TTL = 60  # seconds
+_ownership_cache = TTLCache(maxsize=4096, ttl=OWNERSHIP_CACHE_TTL)
+
 class CalendarDBService:
-    def __init__(self):
-        self.collection = db["calendars"]
+    @property
+    def collection(self):
+        # Resolved per call: services are built at import, before the worker connects
+        return get_db()["calendars"]
 
     async def save_calendar(self, calendar: Calendar) -> Calendar:
         """Save or update a calendar"""
         try:
             await self.collection.update_one(
                 {"id": calendar.id, "user_email": calendar.user_email},
-                {"$set": calendar.dict()},
+                {"$set": calendar.model_dump()},
                 upsert=True
             )
-            logger.info(f"Saved calendar {calendar.name} for user {calendar.user_email}")
+            logger.info("Saved calendar %s for user %s", calendar.name, calendar.user_email)
             return calendar
         except Exception as e:
-            logger.error(f"Error saving calendar: {str(e)}")
+            logger.error("Error saving calendar: %s", e)
             raise
 
     async def save_calendars(self, user_email: str, calendars: List[dict]) -> List[Calendar]:
@@ -49,7 +58,7 @@ class CalendarDBService:
 
             return calendar_models
         except Exception as e:
-            logger.error(f"Error saving calendars for user {user_email}: {str(e)}")
+            logger.error("Error saving calendars for user %s: %s", user_email, e)
             raise
 
     async def get_user_calendars(self, user_email: str) -> List[Calendar]:
@@ -57,9 +66,10 @@ class CalendarDBService:
         try:
             cursor = self.collection.find({"user_email": user_email})
             calendars = await cursor.to_list(length=None)
-            return [Calendar(**cal) for cal in calendars]
+            # Documents were written from validated models; skip re-validation
+            return [Calendar.model_construct(**cal) for cal in calendars]
         except Exception as e:
-            logger.error(f"Error getting calendars for user {user_email}: {str(e)}")
+            logger.error("Error getting calendars for user %s: %s", user_email, e)
             raise
 
     async def get_calendar(self, calendar_id: str, user_email: str) -> Optional[Calendar]:
@@ -69,10 +79,28 @@ class CalendarDBService:
                 "id": calendar_id,
                 "user_email": user_email
             })
-            return Calendar(**calendar) if calendar else None
+            return Calendar.model_construct(**calendar) if calendar else None
+        except Exception as e:
+            logger.error("Error getting calendar %s for user %s: %s", calendar_id, user_email, e)
+            raise
+
+    async def owns_calendar(self, calendar_id: str, user_email: str) -> bool:
+        """Check that a calendar belongs to a user, without loading the document"""
+        key = (user_email, calendar_id)
+        if key in _ownership_cache:
+            return True
+        try:
+            calendar = await self.collection.find_one(
+                {"id": calendar_id, "user_email": user_email},
+                {"_id": 1}
+            )
         except Exception as e:
-            logger.error(f"Error getting calendar {calendar_id} for user {user_email}: {str(e)}")
+            logger.error("Error checking calendar %s for user %s: %s", calendar_id, user_email, e)
             raise
+        if calendar is None:
+            return False
+        _ownership_cache[key] = True
+        return True
 
     async def delete_calendar(self, calendar_id: str, user_email: str) -> bool:
         """Delete a calendar"""
@@ -81,7 +109,8 @@ class CalendarDBService:
                 "id": calendar_id,
                 "user_email": user_email
             })
-            logger.info(f"Deleted calendar {calendar_id} for user {user_email}")
+            _ownership_cache.pop((user_email, calendar_id), None)
+            logger.info("Deleted calendar %s for user %s", calendar_id, user_email)
             return result.deleted_count > 0
         except Exception as e:
             error_msg = f"Error deleting calendar {calendar_id} for user {user_email}: {str(e)}"
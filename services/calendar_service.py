@@ -1,12 +1,20 @@
 import httpx
-from typing import List, Dict
+from typing import List, Dict, Optional
 from fastapi import HTTPException
+from cachetools import TTLCache
 import logging
 from services.event_db import EventDBService
 from services.calendar_db import CalendarDBService
+from services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
+# Calendar list last served per user, including an empty list, so dashboards
+# polling a user with no usable calendars don't call Google on every load.
+# Refreshed by get_calendars and dropped when a calendar is disconnected.
+CALENDAR_LIST_CACHE_TTL = 30  # seconds
+_calendar_list_cache = TTLCache(maxsize=4096, ttl=CALENDAR_LIST_CACHE_TTL)
+
 class CalendarService:
     def __init__(self, oauth_client):
         self.oauth_client = oauth_client
@@ -16,19 +24,20 @@ class CalendarService:
     async def get_calendars(self, token: Dict, user_email: str) -> List[Dict]:
         """Main method: returns list of connected calendars and stores their events"""
         try:
-            async with httpx.AsyncClient() as client:
-                headers = self._get_auth_headers(token)
-                user_info = await self._verify_token(client, headers)
-                calendars = await self._fetch_calendar_list(client, headers)
+            client = get_http_client()
+            headers = self._get_auth_headers(token)
+            user_info = await self._verify_token(client, headers)
+            calendars = await self._fetch_calendar_list(client, headers)
 
-                processed_calendars = await self._process_calendars(client, headers, calendars, token, user_info)
+            processed_calendars = await self._process_calendars(client, headers, calendars, token, user_info)
                 
-                # Store calendars in database
-                await self.calendar_db.save_calendars(user_email, processed_calendars)
+            # Store calendars in database
+            await self.calendar_db.save_calendars(user_email, processed_calendars)
+            _calendar_list_cache[user_email] = processed_calendars
                 
-                return processed_calendars
+            return processed_calendars
         except Exception as e:
-            logger.error(f"Error in get_calendars: {str(e)}")
+            logger.error("Error in get_calendars: %s", e)
             raise HTTPException(status_code=500, detail=f"Failed to fetch calendars: {str(e)}")
 
     def _get_auth_headers(self, token: Dict) -> Dict:
@@ -41,10 +50,10 @@ class CalendarService:
                 headers=headers
             )
             user_info = user_response.json()
-            logger.info(f"Token verified for user: {user_info.get('email')}")
+            logger.info("Token verified for user: %s", user_info.get('email'))
             return user_info
         except Exception as e:
-            logger.error(f"Failed to verify token: {str(e)}")
+            logger.error("Failed to verify token: %s", e)
             raise HTTPException(status_code=401, detail="Invalid token")
 
     async def _fetch_calendar_list(self, client: httpx.AsyncClient, headers: Dict) -> List[Dict]:
@@ -54,7 +63,7 @@ class CalendarService:
             headers=headers
         )
         if not response.is_success:
-            logger.error(f"Failed to fetch calendars: {response.status_code} - {response.text}")
+            logger.error("Failed to fetch calendars: %s - %s", response.status_code, response.text)
             raise HTTPException(status_code=response.status_code, detail="Failed to fetch calendars")
         return response.json().get('items', [])
 
@@ -62,7 +71,7 @@ class CalendarService:
         results = []
         for calendar in calendars:
             access_role = calendar.get('accessRole')
-            logger.info(f"Calendar: {calendar.get('summary')} - Access Role: {access_role}")
+            logger.info("Calendar: %s - Access Role: %s", calendar.get('summary'), access_role)
 
             if access_role in ['owner', 'writer', 'reader']:
                 try:
@@ -81,11 +90,11 @@ class CalendarService:
                         'refreshToken': token.get('refresh_token')
                     })
                 except Exception as e:
-                    logger.error(f"Failed to fetch events for calendar {calendar.get('summary')}: {str(e)}")
+                    logger.error("Failed to fetch events for calendar %s: %s", calendar.get('summary'), e)
             else:
-                logger.info(f"Skipping calendar {calendar.get('summary')} due to insufficient permissions")
+                logger.info("Skipping calendar %s due to insufficient permissions", calendar.get('summary'))
 
-        logger.info(f"Returning {len(results)} calendars with write access")
+        logger.info("Returning %d calendars with write access", len(results))
         return results
 
     async def _fetch_calendar_events(self, client, headers, calendar_id):
@@ -101,22 +110,30 @@ class CalendarService:
         try:
             # Delete events first
             await self.event_db.delete_calendar_events(calendar_id)
-            logger.info(f"Deleted all events for calendar {calendar_id}")
+            logger.info("Deleted all events for calendar %s", calendar_id)
             
             # Then delete the calendar
             deleted = await self.calendar_db.delete_calendar(calendar_id, user_email)
-            logger.info(f"Deleted calendar {calendar_id} for user {user_email}")
+            _calendar_list_cache.pop(user_email, None)
+            logger.info("Deleted calendar %s for user %s", calendar_id, user_email)
             
             return deleted
         except Exception as e:
-            logger.error(f"Error disconnecting calendar {calendar_id}: {str(e)}")
+            logger.error("Error disconnecting calendar %s: %s", calendar_id, e)
             raise HTTPException(status_code=500, detail=f"Failed to disconnect calendar: {str(e)}")
 
+    def get_cached_calendars(self, user_email: str) -> Optional[List[Dict]]:
+        """Get the recently served calendar list for a user, or None if not cached"""
+        return _calendar_list_cache.get(user_email)
+
     async def get_stored_calendars(self, user_email: str) -> List[Dict]:
         """Get calendars from database"""
         try:
-            calendars = await self.calendar_db.get_user_calendars(user_email)
-            return [cal.dict() for cal in calendars]
+            calendars = [cal.model_dump() for cal in await self.calendar_db.get_user_calendars(user_email)]
+            if calendars:
+                # An empty result falls through to Google, which caches the outcome
+                _calendar_list_cache[user_email] = calendars
+            return calendars
         except Exception as e:
-            logger.error(f"Error getting stored calendars for user {user_email}: {str(e)}")
+            logger.error("Error getting stored calendars for user %s: %s", user_email, e)
             raise HTTPException(status_code=500, detail=f"Failed to get calendars: {str(e)}")
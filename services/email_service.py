@@ -1,19 +1,19 @@
+import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
 import logging
 from datetime import datetime
-from db.mongo import db
+from db.mongo import get_db
 from bson import ObjectId
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 class EmailService:
     def __init__(self):
-        self.collection = db["schedule_links"]
+        self.collection = get_db()["schedule_links"]
         self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
         self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
         self.smtp_username = os.getenv("SMTP_USERNAME")
@@ -44,8 +44,8 @@ class EmailService:
         Returns:
         - bool: True if the email was sent successfully, False otherwise
         """
-        logger.info(f"Preparing email notification for advisor: {advisor_email}")
-        logger.info(f"Meeting details: client={client_email}, time={scheduled_date}, duration={duration}min")
+        logger.info("Preparing email notification for advisor: %s", advisor_email)
+        logger.info("Meeting details: client=%s, time=%s, duration=%smin", client_email, scheduled_date, duration)
         
         # Get scheduling link data if ID is provided
         link_data = None
@@ -53,11 +53,11 @@ class EmailService:
             try:
                 link_data = await self.collection.find_one({"_id": ObjectId(scheduling_link_id)})
                 if link_data:
-                    logger.info(f"Found scheduling link: {link_data.get('slug')}")
+                    logger.info("Found scheduling link: %s", link_data.get('slug'))
                 else:
-                    logger.warning(f"Scheduling link with ID {scheduling_link_id} not found")
+                    logger.warning("Scheduling link with ID %s not found", scheduling_link_id)
             except Exception as e:
-                logger.error(f"Error retrieving scheduling link {scheduling_link_id}: {str(e)}")
+                logger.error("Error retrieving scheduling link %s: %s", scheduling_link_id, e)
         
         # Format date
         formatted_date = scheduled_date.strftime("%A, %B %d, %Y at %I:%M %p")
@@ -112,22 +112,30 @@ class EmailService:
         
         message.attach(MIMEText(html, "html"))
         
-        # Send email
+        # Send email. smtplib blocks, so the SMTP exchange runs in a worker
+        # thread instead of stalling every other request on the event loop
         try:
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(message)
-                logger.info(f"Meeting notification email sent to {advisor_email}")
-                return True
+            await asyncio.to_thread(self._send_message, message)
+            logger.info("Meeting notification email sent to %s", advisor_email)
+            return True
         except Exception as e:
-            logger.error(f"Failed to send meeting notification email: {str(e)}")
+            logger.error("Failed to send meeting notification email: %s", e)
             return False
 
-# Create an instance of EmailService
-email_service = EmailService()
+    def _send_message(self, message: MIMEMultipart) -> None:
+        """Deliver a message over SMTP with STARTTLS (blocking)"""
+        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+            server.starttls()
+            server.login(self.smtp_username, self.smtp_password)
+            server.send_message(message)
+
+# Instance of EmailService, created on first use once the database client exists
+email_service = None
 
 # Expose the send_meeting_notification function
 async def send_meeting_notification(*args, **kwargs):
     """Wrapper function to call send_meeting_notification on the email_service instance"""
+    global email_service
+    if email_service is None:
+        email_service = EmailService()
     return await email_service.send_meeting_notification(*args, **kwargs) 
\ No newline at end of file
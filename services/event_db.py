@@ -1,14 +1,15 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from motor.motor_asyncio import AsyncIOMotorDatabase
-from db.mongo import db
+from db.mongo import get_db
 import logging
 
 logger = logging.getLogger(__name__)
 
 class EventDBService:
-    def __init__(self):
-        self.collection = db["events"]
+    @property
+    def collection(self):
+        # Resolved per call: services are built at import, before the worker connects
+        return get_db()["events"]
 
     async def create_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new event"""
@@ -18,7 +19,7 @@ class EventDBService:
             event_data["_id"] = str(result.inserted_id)
             return event_data
         except Exception as e:
-            logger.error(f"Error creating event: {str(e)}")
+            logger.error("Error creating event: %s", e)
             raise
 
     async def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
@@ -29,7 +30,7 @@ class EventDBService:
                 event["_id"] = str(event["_id"])
             return event
         except Exception as e:
-            logger.error(f"Error getting event: {str(e)}")
+            logger.error("Error getting event: %s", e)
             raise
 
     async def get_events_by_user(self, user_id: str) -> List[Dict[str, Any]]:
@@ -41,7 +42,7 @@ class EventDBService:
                 event["_id"] = str(event["_id"])
             return events
         except Exception as e:
-            logger.error(f"Error getting user events: {str(e)}")
+            logger.error("Error getting user events: %s", e)
             raise
 
     async def update_event(self, event_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -59,7 +60,7 @@ class EventDBService:
                 return event
             return None
         except Exception as e:
-            logger.error(f"Error updating event: {str(e)}")
+            logger.error("Error updating event: %s", e)
             raise
 
     async def delete_event(self, event_id: str) -> bool:
@@ -68,7 +69,7 @@ class EventDBService:
             result = await self.collection.delete_one({"_id": event_id})
             return result.deleted_count > 0
         except Exception as e:
-            logger.error(f"Error deleting event: {str(e)}")
+            logger.error("Error deleting event: %s", e)
             raise
 
     async def get_events_by_date_range(
@@ -89,7 +90,7 @@ class EventDBService:
                 event["_id"] = str(event["_id"])
             return events
         except Exception as e:
-            logger.error(f"Error getting events by date range: {str(e)}")
+            logger.error("Error getting events by date range: %s", e)
             raise
 
     async def save_events(self, calendar_id: str, events: List[dict]) -> List[dict]:
@@ -101,10 +102,10 @@ class EventDBService:
                 await self._upsert_event(event)
                 event_models.append(event)
             
-            logger.info(f"Processed {len(event_models)} events for calendar {calendar_id}")
+            logger.info("Processed %d events for calendar %s", len(event_models), calendar_id)
             return event_models
         except Exception as e:
-            logger.error(f"Error saving events: {str(e)}")
+            logger.error("Error saving events: %s", e)
             raise
 
     def _parse_event_dict(self, calendar_id: str, event: dict) -> dict:
@@ -148,22 +149,28 @@ class EventDBService:
             )
             
             if result.upserted_id:
-                logger.info(f"Added new event {event['summary']} for calendar {event['calendar_id']}")
+                logger.info("Added new event %s for calendar %s", event['summary'], event['calendar_id'])
             else:
-                logger.info(f"Updated event {event['summary']} for calendar {event['calendar_id']}")
+                logger.info("Updated event %s for calendar %s", event['summary'], event['calendar_id'])
         except Exception as e:
-            logger.error(f"Error upserting event: {str(e)}")
+            logger.error("Error upserting event: %s", e)
             raise
 
-    async def get_calendar_events(self, calendar_id: str, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[dict]:
-        """Get all events for a calendar within an optional time range"""
+    async def get_calendar_events(
+        self,
+        calendar_id: str,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
+        """Get all events for a calendar within an optional time range, optionally projected"""
         try:
             query = {"calendar_id": calendar_id}
             if start_time and end_time:
                 query["start_time"] = {"$gte": start_time}
                 query["end_time"] = {"$lte": end_time}
 
-            cursor = self.collection.find(query)
+            cursor = self.collection.find(query, projection)
             events = await cursor.to_list(length=None)
             
             # Convert the dictionary data to formatted events
@@ -176,15 +183,15 @@ class EventDBService:
                 
             return formatted_events
         except Exception as e:
-            logger.error(f"Error getting events for calendar {calendar_id}: {str(e)}")
+            logger.error("Error getting events for calendar %s: %s", calendar_id, e)
             raise
 
     async def delete_calendar_events(self, calendar_id: str) -> bool:
         """Delete all events for a calendar"""
         try:
             result = await self.collection.delete_many({"calendar_id": calendar_id})
-            logger.info(f"Deleted {result.deleted_count} events for calendar {calendar_id}")
+            logger.info("Deleted %s events for calendar %s", result.deleted_count, calendar_id)
             return result.deleted_count > 0
         except Exception as e:
-            logger.error(f"Error deleting events for calendar {calendar_id}: {str(e)}")
+            logger.error("Error deleting events for calendar %s: %s", calendar_id, e)
             raise
@@ -2,8 +2,7 @@ from google import genai
 import os
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 class GeminiService:
@@ -48,5 +47,16 @@ class GeminiService:
             return response.text.strip() if response.text else "No summary generated."
 
         except Exception as e:
-            logger.error(f"Error in generate_linkedin_analysis: {str(e)}")
+            logger.error("Error in generate_linkedin_analysis: %s", e)
             return f"Error: {str(e)}"
+
+# Instance of GeminiService, created on first use so a missing API key only
+# affects enrichment; it holds the genai client for every later call
+gemini_service = None
+
+def get_gemini_service() -> GeminiService:
+    """Get the shared GeminiService, creating it on first call"""
+    global gemini_service
+    if gemini_service is None:
+        gemini_service = GeminiService()
+    return gemini_service
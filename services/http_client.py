@@ -0,0 +1,23 @@
+from typing import Optional
+import httpx
+
+# One client per worker process so OAuth and Google API calls reuse pooled
+# keep-alive connections instead of paying a TLS handshake per request
+_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first call"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=50),
+        )
+    return _client
+
+async def close_http_client():
+    """Close the shared HTTP client; called on application shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
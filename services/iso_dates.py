@@ -0,0 +1,21 @@
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+import sys
+
+# Python 3.11+ parses a trailing 'Z' itself; older versions need it rewritten
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+def parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 string with datetime.fromisoformat, which runs in C, accepting a trailing 'Z'"""
+    if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+def link_expiration_date(link: Dict[str, Any]) -> Optional[date]:
+    """A link's expiration day, in the timezone it was stored with, or None if it never expires"""
+    value = link.get("expirationDate")
+    if not value:
+        return None
+    if isinstance(value, str):
+        value = parse_iso_datetime(value)
+    return value.date() if isinstance(value, datetime) else value
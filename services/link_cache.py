@@ -0,0 +1,48 @@
+from typing import Optional, Dict, Any
+from db.mongo import get_db
+from cachetools import TTLCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Schedule link documents by slug for the public pages, which are loaded far
+# more often than links change. Writes to a link invalidate its slug; other
+# workers see the change within the TTL.
+LINK_CACHE_TTL = 30  # seconds
+_link_cache = TTLCache(maxsize=4096, ttl=LINK_CACHE_TTL)
+
+# Unknown slugs are remembered briefly so scans and typos don't each cost a query
+MISSING_LINK_TTL = 5  # seconds
+_missing_slugs = TTLCache(maxsize=4096, ttl=MISSING_LINK_TTL)
+
+# Matches a link only while it has uses left (a falsy maxUses means unlimited).
+# Endpoints that consume a use put it in a find_one_and_update filter together
+# with their {"$inc": {"uses": 1}}, so the check never reads a stale count.
+USES_LEFT_FILTER = {
+    "$or": [
+        {"maxUses": None},
+        {"maxUses": 0},
+        {"$expr": {"$lt": [{"$ifNull": ["$uses", 0]}, "$maxUses"]}}
+    ]
+}
+
+async def get_link_by_slug(slug: str) -> Optional[Dict[str, Any]]:
+    """Get a schedule link by slug; the returned document is shared, don't mutate it"""
+    link = _link_cache.get(slug)
+    if link is not None:
+        return link
+    if slug in _missing_slugs:
+        return None
+
+    link = await get_db()["schedule_links"].find_one({"slug": slug})
+    if link is None:
+        _missing_slugs[slug] = True
+    else:
+        _link_cache[slug] = link
+    return link
+
+def invalidate_link(slug: Optional[str]) -> None:
+    """Forget a slug after its link was created, changed or deleted"""
+    if slug:
+        _link_cache.pop(slug, None)
+        _missing_slugs.pop(slug, None)
@@ -4,15 +4,14 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import os, time, json, logging, base64
-from .gemini_service import GeminiService
+from .gemini_service import get_gemini_service
 from datetime import datetime, timezone
 from bson import ObjectId
 from typing import List, Optional, Dict, Any
-from db.mongo import db
+from db.mongo import get_db
 from models.scheduled_events import ScheduledEventAnswer
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once in db/mongo.py
 logger = logging.getLogger(__name__)
 
 def load_cookies_from_env():
@@ -27,15 +26,15 @@ def load_cookies_from_env():
         cookies = json.loads(decoded)
         print("cookies", cookies)
 
-        logger.info(f"[LinkedIn Scraper] Successfully loaded {len(cookies)} cookies")
+        logger.info("[LinkedIn Scraper] Successfully loaded %d cookies", len(cookies))
         return cookies
 
     except (json.JSONDecodeError, base64.binascii.Error) as e:
-        logger.error(f"[LinkedIn Scraper] Cookie decode/parsing error: {e}")
+        logger.error("[LinkedIn Scraper] Cookie decode/parsing error: %s", e)
         raise
 
     except Exception as e:
-        logger.error(f"[LinkedIn Scraper] Unexpected error loading cookies: {e}")
+        logger.error("[LinkedIn Scraper] Unexpected error loading cookies: %s", e)
         raise
 
 def add_cookies_to_driver(driver, cookies):
@@ -79,7 +78,7 @@ def _scrape_linkedin_with_selenium(profile_url: str) -> str:
             cookies = load_cookies_from_env()
             add_cookies_to_driver(driver, cookies)
         except Exception as e:
-            logger.warning(f"[LinkedIn Scraper] Failed to load cookies from environment: {str(e)}")
+            logger.warning("[LinkedIn Scraper] Failed to load cookies from environment: %s", e)
 
         # Step 3: Reload page to apply cookies
         logger.info("[LinkedIn Scraper] Applying cookies and checking login status")
@@ -92,7 +91,7 @@ def _scrape_linkedin_with_selenium(profile_url: str) -> str:
             return "Login failed — cookies may be expired or invalid."
 
         # Step 4: Go to target profile
-        logger.info(f"[LinkedIn Scraper] Accessing profile: {profile_url}")
+        logger.info("[LinkedIn Scraper] Accessing profile: %s", profile_url)
         driver.get(f"{profile_url}/recent-activity/shares/")
         time.sleep(5)
 
@@ -124,18 +123,18 @@ def _scrape_linkedin_with_selenium(profile_url: str) -> str:
                     posts.append(text)
 
             except Exception as e:
-                logger.warning(f"[LinkedIn Scraper] Error processing post: {str(e)}")
+                logger.warning("[LinkedIn Scraper] Error processing post: %s", e)
                 continue
 
         if posts:
             print("posts", posts, "\n\n---\n\n")
             return "\n\n---\n\n".join(posts)
         else:
-            logger.warning(f"No posts found on profile: {profile_url}")
+            logger.warning("No posts found on profile: %s", profile_url)
             return None
 
     except Exception as e:
-        logger.error(f"[LinkedIn Scraper] Scraping failed: {str(e)}")
+        logger.error("[LinkedIn Scraper] Scraping failed: %s", e)
         return f"Could not scrape profile due to error: {str(e)}"
     finally:
         if driver:
@@ -153,15 +152,16 @@ async def create_linkedin_summary(event_id: str, profile_url: str, questions: Li
         questions: List of questions asked during booking
         answers: List of answers provided during booking
     """
+    db = get_db()
     try:
-        logger.info(f"[LinkedIn Analysis] Starting LinkedIn analysis for event {event_id}")
-        logger.info(f"[LinkedIn Analysis] Profile URL: {profile_url}")
+        logger.info("[LinkedIn Analysis] Starting LinkedIn analysis for event %s", event_id)
+        logger.info("[LinkedIn Analysis] Profile URL: %s", profile_url)
         
         # Scrape LinkedIn posts using Selenium
         linkedin_data = _scrape_linkedin_with_selenium(profile_url)
         
         if not linkedin_data:
-            logger.warning(f"[LinkedIn Analysis] No posts found for profile: {profile_url}")
+            logger.warning("[LinkedIn Analysis] No posts found for profile: %s", profile_url)
             enrichment = {
                 "linkedin_summary": "No posts found on profile to enrich the meeting notes.",
                 "enriched_at": datetime.now(timezone.utc)
@@ -174,7 +174,7 @@ async def create_linkedin_summary(event_id: str, profile_url: str, questions: Li
             return
             
         if linkedin_data.startswith("Could not scrape profile due to error:"):
-            logger.error(f"[LinkedIn Analysis] Scraping failed: {linkedin_data}")
+            logger.error("[LinkedIn Analysis] Scraping failed: %s", linkedin_data)
             enrichment = {
                 "linkedin_summary": "Unable to analyze LinkedIn profile at this time.",
                 "enriched_at": datetime.now(timezone.utc)
@@ -191,8 +191,7 @@ async def create_linkedin_summary(event_id: str, profile_url: str, questions: Li
         answer_texts = "\n".join([f"{a.question}: {a.answer}" for a in answers]) if answers else ""
         
         # Use GeminiService to analyze the data
-        logger.info("[LinkedIn Analysis] Initializing GeminiService")
-        gemini_service = GeminiService()
+        gemini_service = get_gemini_service()
         
         logger.info("[LinkedIn Analysis] Sending data to Gemini API")
         linkedin_summary = gemini_service.generate_linkedin_analysis(
@@ -203,7 +202,7 @@ async def create_linkedin_summary(event_id: str, profile_url: str, questions: Li
         logger.info("[LinkedIn Analysis] Gemini API analysis completed")
         
         if linkedin_summary.startswith("Error:"):
-            logger.error(f"[LinkedIn Analysis] Gemini API error: {linkedin_summary}")
+            logger.error("[LinkedIn Analysis] Gemini API error: %s", linkedin_summary)
             return
             
         # Create enrichment object
@@ -220,11 +219,11 @@ async def create_linkedin_summary(event_id: str, profile_url: str, questions: Li
         )
         
         if result.modified_count > 0:
-            logger.info(f"[LinkedIn Analysis] Successfully updated event {event_id}")
+            logger.info("[LinkedIn Analysis] Successfully updated event %s", event_id)
         else:
-            logger.warning(f"[LinkedIn Analysis] Failed to update event {event_id}")
+            logger.warning("[LinkedIn Analysis] Failed to update event %s", event_id)
             
     except Exception as e:
-        logger.error(f"[LinkedIn Analysis] Critical error for event {event_id}: {str(e)}")
+        logger.error("[LinkedIn Analysis] Critical error for event %s: %s", event_id, e)
         logger.exception("[LinkedIn Analysis] Full traceback:")
         raise  # Re-raise the exception after logging
\ No newline at end of file
@@ -1,14 +1,30 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
-from db.mongo import db
+from db.mongo import get_db
+from cachetools import TTLCache
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Sanitized user documents by email. The dashboard polls /auth/me, so a short
+# TTL absorbs repeat reads; writes through this service invalidate the entry.
+USER_CACHE_TTL = 10  # seconds
+_user_cache = TTLCache(maxsize=4096, ttl=USER_CACHE_TTL)
+
+def invalidate_user(email: Optional[str]) -> None:
+    """Forget a cached user, e.g. when they log out"""
+    if email:
+        _user_cache.pop(email, None)
+
 class UserService:
     def __init__(self):
         self.collection_name = "users"
-        self.collection = db[self.collection_name]
+
+    @property
+    def collection(self):
+        # Resolved per call: services are built at import, before the worker connects
+        return get_db()[self.collection_name]
 
     async def create_or_update_google_user(
         self,
@@ -29,7 +45,7 @@ class UserService:
                 "id": google_id,
                 "access_token": tokens["access_token"],
                 "refresh_token": tokens.get("refresh_token"),
-                "expires_at": datetime.utcnow().timestamp() + tokens.get("expires_in", 3600)
+                "expires_at": int(time.time()) + tokens.get("expires_in", 3600)
             },
             "updated_at": now
         }
@@ -44,7 +60,7 @@ class UserService:
                     {"email": email},
                     {"$set": update_doc}
                 )
-                logger.info(f"Updated Google tokens for user {email}")
+                logger.info("Updated Google tokens for user %s", email)
             else:
                 # Create new user
                 new_user = {
@@ -52,7 +68,9 @@ class UserService:
                     "created_at": now
                 }
                 await self.collection.insert_one(new_user)
-                logger.info(f"Created new user {email}")
+                logger.info("Created new user %s", email)
+
+            _user_cache.pop(email, None)
 
             # Get the updated/created document
             user = await self.collection.find_one({"email": email})
@@ -67,7 +85,7 @@ class UserService:
             return user
 
         except Exception as e:
-            logger.error(f"Error in create_or_update_google_user: {str(e)}")
+            logger.error("Error in create_or_update_google_user: %s", e)
             raise
 
     async def update_hubspot_tokens(
@@ -90,7 +108,7 @@ class UserService:
                 }
             else:
                 # If tokens provided, update hubspot data
-                expires_at = now.timestamp() + tokens.get("expires_in", 3600)
+                expires_at = int(time.time()) + tokens.get("expires_in", 3600)
                 update_doc = {
                     "$set": {
                         "hubspot": {
@@ -108,6 +126,7 @@ class UserService:
                 {"email": email},
                 update_doc
             )
+            _user_cache.pop(email, None)
 
             if result.modified_count > 0 or result.matched_count > 0:
                 user = await self.collection.find_one({"email": email})
@@ -118,15 +137,18 @@ class UserService:
                     user["_id"] = str(user["_id"])
                 return user
             
-            logger.warning(f"No user found to update HubSpot tokens for {email}")
+            logger.warning("No user found to update HubSpot tokens for %s", email)
             return None
 
         except Exception as e:
-            logger.error(f"Error updating HubSpot tokens: {str(e)}")
+            logger.error("Error updating HubSpot tokens: %s", e)
             raise
 
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get a user by email, excluding sensitive data"""
+        cached = _user_cache.get(email)
+        if cached is not None:
+            return cached
         try:
             user = await self.collection.find_one({"email": email})
             if user:
@@ -134,9 +156,10 @@ class UserService:
                 user.pop("google", None)
                 user.pop("hubspot", None)
                 user["_id"] = str(user["_id"])
+                _user_cache[email] = user
             return user
         except Exception as e:
-            logger.error(f"Error getting user by email: {str(e)}")
+            logger.error("Error getting user by email: %s", e)
             raise
 
     async def get_user_tokens(self, email: str) -> Optional[Dict[str, Any]]:
@@ -148,14 +171,15 @@ class UserService:
             )
             return user
         except Exception as e:
-            logger.error(f"Error getting user tokens: {str(e)}")
+            logger.error("Error getting user tokens: %s", e)
             raise
 
     async def delete_user(self, email: str) -> bool:
         """Delete a user by email"""
         try:
             result = await self.collection.delete_one({"email": email})
+            _user_cache.pop(email, None)
             return result.deleted_count > 0
         except Exception as e:
-            logger.error(f"Error deleting user: {str(e)}")
+            logger.error("Error deleting user: %s", e)
             raise
\ No newline at end of file
@@ -0,0 +1,33 @@
+import logging
+
+from uvicorn.workers import UvicornWorker
+
+# Load balancer health checks and Prometheus scrapes; one access log line per
+# probe is pure noise (and a stdout write per request)
+QUIET_PATHS = frozenset({"/", "/metrics", "/metrics/"})
+
+
+class QuietProbeFilter(logging.Filter):
+    """Drops uvicorn access log records for QUIET_PATHS"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn.access args: (client_addr, method, path, http_version, status_code)
+        args = record.args
+        return not (isinstance(args, tuple) and len(args) > 2 and args[2] in QUIET_PATHS)
+
+
+class UvloopWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and the httptools HTTP parser.
+
+    The stock worker uses "auto", which silently falls back to the pure-Python
+    asyncio loop and h11 when the C extensions are missing.
+
+    gunicorn's worker_connections only applies to its sync/eventlet/gevent
+    workers, so the per-worker concurrency cap is set here instead; requests
+    past it get a 503 rather than queueing on a saturated event loop.
+    """
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "limit_concurrency": 512}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        logging.getLogger("uvicorn.access").addFilter(QuietProbeFilter())